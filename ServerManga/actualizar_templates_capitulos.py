@@ -1,12 +1,23 @@
+import hashlib
+import json
 import os
 import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from database.db_manager import DatabaseManager
+from utils.html_gzip import guardar_html
+from utils.plantillas import cargar_plantilla
 
 TEMPLATE_PATH = '/home/pablopi/Server/ServerManga/templates/capitulo_template.html'
 
+# Firma de cada capitulo generado en la ultima pasada. Va en la raiz del manga
+# (junto a capitulos.json), no en contenido/: escribirlo alli cambiaba el mtime
+# del directorio y forzaba a reconstruir el manifiesto en cada pasada
+ESTADO_FILE = '.estado_plantillas.json'
+
 def leer_template():
-    with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
-        return f.read()
+    return cargar_plantilla(TEMPLATE_PATH)
 
 def extraer_numero_capitulo(filename):
     """Extrae numero de capitulo sin .00 decimales"""
@@ -60,43 +71,87 @@ def extraer_imagenes(html_path):
     return images
 
 def generar_html(template, manga_id, manga_title, chapter_num, images, prev_file, next_file):
-    """Genera HTML con template"""
-    images_html = ''
-    for img in images:
-        images_html += f'        <img src="{img}" alt="Pagina" loading="lazy">\n'
-    
-    html = template.replace('{{MANGA_TITLE}}', manga_title)
-    html = html.replace('{{CHAPTER_NUM}}', str(chapter_num))
-    html = html.replace('{{MANGA_ID}}', str(manga_id))
-    html = html.replace('{{IMAGES}}', images_html)
-    html = html.replace('{{PREV_CHAPTER}}', prev_file if prev_file else '#')
-    html = html.replace('{{NEXT_CHAPTER}}', next_file if next_file else '#')
-    html = html.replace('{{PREV_DISABLED}}', '' if prev_file else 'disabled')
-    html = html.replace('{{NEXT_DISABLED}}', '' if next_file else 'disabled')
-    
-    return html
+    """Genera HTML con template (Plantilla compilada)"""
+    images_html = ''.join(f'        <img src="{img}" alt="Pagina" loading="lazy">\n' for img in images)
+    
+    return template.render(
+        MANGA_TITLE=manga_title,
+        CHAPTER_NUM=chapter_num,
+        MANGA_ID=manga_id,
+        IMAGES=images_html,
+        PREV_CHAPTER=prev_file if prev_file else '#',
+        NEXT_CHAPTER=next_file if next_file else '#',
+        PREV_DISABLED='' if prev_file else 'disabled',
+        NEXT_DISABLED='' if next_file else 'disabled'
+    )
 
-def recrear_capitulos_manga(manga, template):
-    """Recrea todos los capitulos de un manga"""
+def cargar_estado(local_path):
+    """Estado de la ultima regeneracion: {cap_file: {firma, mtime_ns, size}}"""
+    try:
+        with open(os.path.join(local_path, ESTADO_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    # Estado de versiones anteriores (dentro de contenido/): se aprovecha una vez
+    antiguo = os.path.join(local_path, 'contenido', ESTADO_FILE)
+    try:
+        with open(antiguo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def guardar_estado(local_path, estado):
+    ruta = os.path.join(local_path, ESTADO_FILE)
+    with open(ruta + '.part', 'w', encoding='utf-8') as f:
+        json.dump(estado, f)
+    os.replace(ruta + '.part', ruta)
+    
+    # Quitar el de contenido/ si quedaba de versiones anteriores
+    try:
+        os.remove(os.path.join(local_path, 'contenido', ESTADO_FILE))
+    except FileNotFoundError:
+        pass
+
+def calcular_firma(template, manga_id, manga_title, chapter_num, prev_file, next_file):
+    """Todo lo que cambia el HTML salvo las imagenes (que salen del propio HTML)"""
+    datos = '\0'.join([template.hash, str(manga_id), manga_title, str(chapter_num),
+                        prev_file or '', next_file or ''])
+    return hashlib.sha1(datos.encode('utf-8')).hexdigest()
+
+def recrear_capitulos_manga(manga, template=None):
+    """
+    Recrea los capitulos de un manga.
+    Salta los que no han cambiado desde la ultima pasada (mismo template,
+    mismos prev/next y HTML intacto -> mismas imagenes) sin abrirlos.
+    Retorna {'actualizados', 'saltados', 'capitulos', 'lineas'}; las lineas se
+    imprimen juntas para que no se mezclen entre procesos
+    """
+    template = template or leer_template()
     manga_id = manga['id']
     manga_title = manga['title']
     local_path = manga['local_storage_path']
     contenido_dir = os.path.join(local_path, 'contenido')
     
-    print(f"\n[PROCESANDO] {manga_title} (ID: {manga_id})")
-    print(f"  Path: {local_path}")
+    lineas = [f"\n[PROCESANDO] {manga_title} (ID: {manga_id})", f"  Path: {local_path}"]
+    resultado = {'actualizados': 0, 'saltados': 0, 'capitulos': 0, 'lineas': lineas}
     
     capitulos = listar_capitulos(contenido_dir)
     
     if not capitulos:
-        print(f"  [SKIP] Sin capitulos")
-        return 0
+        lineas.append(f"  [SKIP] Sin capitulos")
+        return resultado
     
-    print(f"  Capitulos encontrados: {len(capitulos)}")
+    lineas.append(f"  Capitulos encontrados: {len(capitulos)}")
+    resultado['capitulos'] = len(capitulos)
     
+    estado = cargar_estado(local_path)
+    nuevo_estado = {}
     actualizados = 0
+    saltados = 0
     errores = []
     
+    # listar_capitulos sale de os.listdir: prev/next existen seguro
     for idx, cap_file in enumerate(capitulos):
         cap_path = os.path.join(contenido_dir, cap_file)
         chapter_num = extraer_numero_capitulo(cap_file)
@@ -106,24 +161,20 @@ def recrear_capitulos_manga(manga, template):
             continue
         
         # Determinar prev/next
-        prev_file = None
-        next_file = None
-        
-        if idx > 0:
-            prev_file = capitulos[idx - 1]
-            # Validar existencia
-            if not os.path.exists(os.path.join(contenido_dir, prev_file)):
-                errores.append(f"[{manga_title}] Cap {chapter_num}: Prev no existe: {prev_file}")
-                prev_file = None
-        
-        if idx < len(capitulos) - 1:
-            next_file = capitulos[idx + 1]
-            # Validar existencia
-            if not os.path.exists(os.path.join(contenido_dir, next_file)):
-                errores.append(f"[{manga_title}] Cap {chapter_num}: Next no existe: {next_file}")
-                next_file = None
+        prev_file = capitulos[idx - 1] if idx > 0 else None
+        next_file = capitulos[idx + 1] if idx < len(capitulos) - 1 else None
         
         try:
+            firma = calcular_firma(template, manga_id, manga_title, chapter_num, prev_file, next_file)
+            st = os.stat(cap_path)
+            anterior = estado.get(cap_file)
+            
+            if (anterior and anterior['firma'] == firma
+                    and anterior['mtime_ns'] == st.st_mtime_ns and anterior['size'] == st.st_size):
+                nuevo_estado[cap_file] = anterior
+                saltados += 1
+                continue
+            
             # Extraer imagenes del HTML actual
             images = extraer_imagenes(cap_path)
             
@@ -138,51 +189,77 @@ def recrear_capitulos_manga(manga, template):
             )
             
             # Escribir
-            with open(cap_path, 'w', encoding='utf-8') as f:
-                f.write(nuevo_html)
+            guardar_html(cap_path, nuevo_html)
             
+            st = os.stat(cap_path)
+            nuevo_estado[cap_file] = {'firma': firma, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
             actualizados += 1
             
         except Exception as e:
             errores.append(f"[{manga_title}] Cap {chapter_num}: {e}")
     
-    print(f"  [OK] {actualizados}/{len(capitulos)} actualizados")
+    guardar_estado(local_path, nuevo_estado)
+    
+    lineas.append(f"  [OK] {actualizados}/{len(capitulos)} actualizados, {saltados} sin cambios")
     
     if errores:
-        print(f"  [ERRORES] {len(errores)}:")
+        lineas.append(f"  [ERRORES] {len(errores)}:")
         for err in errores:
-            print(f"    - {err}")
+            lineas.append(f"    - {err}")
     
-    return actualizados
+    resultado['actualizados'] = actualizados
+    resultado['saltados'] = saltados
+    return resultado
 
 def main():
     print("=" * 70)
     print("RECREACION DE CAPITULOS DESDE BASE DE DATOS")
     print("=" * 70)
     
+    # Uso: python3 actualizar_templates_capitulos.py [procesos]  (1 = en serie)
+    procesos = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    
     if not os.path.exists(TEMPLATE_PATH):
         print(f"[ERROR] Template no existe: {TEMPLATE_PATH}")
         return
     
-    template = leer_template()
-    
     db = DatabaseManager()
     mangas = db.get_all_manga()
     
     print(f"\nMangas en BD: {len(mangas)}")
+    print(f"Procesos: {procesos}")
     
     confirmacion = input("\nContinuar? (s/n): ").lower()
     if confirmacion != 's':
         print("Operacion cancelada")
         return
     
-    total = 0
-    for manga in mangas:
-        total += recrear_capitulos_manga(manga, template)
+    t_inicio = time.time()
+    resultados = []
+    
+    if procesos <= 1:
+        template = leer_template()
+        for manga in mangas:
+            resultado = recrear_capitulos_manga(manga, template)
+            print('\n'.join(resultado['lineas']))
+            resultados.append(resultado)
+    else:
+        # Un manga por tarea; cada proceso compila el template una vez
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for resultado in pool.map(recrear_capitulos_manga, mangas):
+                print('\n'.join(resultado['lineas']))
+                resultados.append(resultado)
+    
+    t_total = time.time() - t_inicio
+    total = sum(r['actualizados'] for r in resultados)
+    saltados = sum(r['saltados'] for r in resultados)
+    capitulos = sum(r['capitulos'] for r in resultados)
+    ritmo = capitulos / t_total if t_total > 0 else 0
     
     print("\n" + "=" * 70)
-    print(f"TOTAL CAPITULOS RECREADOS: {total}")
+    print(f"TOTAL CAPITULOS RECREADOS: {total} (sin cambios: {saltados})")
+    print(f"Tiempo: {t_total:.1f}s | {ritmo:.1f} capitulos/s")
     print("=" * 70)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -4,6 +4,9 @@ Worker que checkea capitulos nuevos Y descarga automaticamente
 """
 import sys
 import os
+import time
+import queue
+import threading
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
@@ -12,6 +15,8 @@ from database.db_manager import DatabaseManager
 from check_worker import check_all_manga, check_single_manga
 from download_worker import download_manga
 from utils.logger import Logger, create_log_path
+from utils import http_pool
+from utils.cache_respuestas import resumen_caches
 
 def check_and_download_single(id = 0, mode_debug = True, logger = None):
     """Chequear capitulos y descargar nuevos automaticamente de un solo manga"""
@@ -47,8 +52,13 @@ def check_and_download_single(id = 0, mode_debug = True, logger = None):
     
     return results, descargados, check_time
 
-def check_and_download(page_mode=0, mode_debug=True, logger=None):
-    """Chequear capitulos y descargar nuevos automaticamente"""
+def check_and_download(page_mode=0, mode_debug=True, logger=None, streaming=False, incremental=False):
+    """
+    Chequear capitulos y descargar nuevos automaticamente
+    streaming=True -> cada resultado con nuevos pasa a una cola de descargas
+    que se consume mientras el resto de paginas sigue chequeandose
+    incremental=True -> solo se chequean los titulos que tocan (ver check_all_manga)
+    """
     msg = f"\n{'='*60}"
     if mode_debug:
         print(msg)
@@ -74,10 +84,99 @@ def check_and_download(page_mode=0, mode_debug=True, logger=None):
     if logger:
         logger.log(msg)
     
-    results, check_time = check_all_manga(page_mode, mode_debug=mode_debug, logger=logger)    
+    if streaming:
+        return _check_and_download_streaming(page_mode, mode_debug=mode_debug, logger=logger, incremental=incremental)
+    
+    results, check_time = check_all_manga(page_mode, mode_debug=mode_debug, logger=logger, incremental=incremental)    
     results, descargados, check_time = _download_mangas(results, check_time, mode_debug=mode_debug, logger=logger)
     
     return results, descargados, check_time
+
+
+def _check_and_download_streaming(page_mode=0, mode_debug=True, logger=None, incremental=False):
+    """Check y descarga solapados: los checkers producen, un hilo descarga"""
+    cola_descargas = queue.Queue()
+    estado = {'descargados': 0}
+    
+    def _encolar(result):
+        if result.get('has_new', False):
+            msg = f"  [COLA] {result['title']} encolado para descarga"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+            cola_descargas.put(result)
+    
+    consumidor = threading.Thread(
+        target=_consumir_descargas,
+        args=(cola_descargas, estado),
+        kwargs={'mode_debug': mode_debug, 'logger': logger},
+        name='descargas',
+        daemon=True
+    )
+    consumidor.start()
+    
+    try:
+        results, check_time = check_all_manga(page_mode, mode_debug=mode_debug, logger=logger, callback=_encolar, incremental=incremental)
+    finally:
+        # Fin de productores: el consumidor termina lo pendiente y sale
+        cola_descargas.put(None)
+        consumidor.join()
+    
+    if not results:
+        msg = "\n[INFO] No hay manga en seguimiento o no se pudieron chequear"
+        print(msg)
+        if logger:
+            logger.log(msg)
+        return [], 0, check_time
+    
+    return results, estado['descargados'], check_time
+
+
+def _consumir_descargas(cola_descargas, estado, mode_debug=True, logger=None):
+    """
+    Hilo consumidor de la cola de descargas. Es el unico que toca Playwright
+    (la API sync no se puede compartir entre hilos). El browser se lanza
+    con el primer manga encolado, si no hay nuevos no se abre Chromium
+    """
+    p = None
+    browser = None
+    
+    try:
+        while True:
+            result = cola_descargas.get()
+            if result is None:
+                break
+            
+            try:
+                if browser is None:
+                    msg = "\n[FASE 2] Descargando capitulos nuevos (en paralelo al chequeo)..."
+                    if mode_debug:
+                        print(msg)
+                    if logger:
+                        logger.log(msg)
+                    
+                    from playwright.sync_api import sync_playwright
+                    p = sync_playwright().start()
+                    browser = p.chromium.launch(headless=True)
+                
+                browser = _descargar_resultado(result, p, browser, mode_debug=mode_debug, logger=logger)
+                if result['downloaded']:
+                    estado['descargados'] += 1
+            
+            except Exception as e:
+                result['downloaded'] = False
+                msg = f"[ERROR] Descargando {result['title']}: {e}"
+                print(msg)
+                if logger:
+                    logger.log(msg)
+                    import traceback
+                    logger.log(traceback.format_exc())
+    finally:
+        if browser:
+            browser.close()
+        if p:
+            p.stop()
     
 
 def _download_mangas(results, check_time, mode_debug=True, logger=None):    
@@ -126,7 +225,6 @@ def _download_mangas(results, check_time, mode_debug=True, logger=None):
     
     descargados = 0
     
-    from download_worker import download_manga_from_list, download_manga
     from playwright.sync_api import sync_playwright
     
     # Crear browser UNA VEZ para todos los mangas
@@ -134,96 +232,109 @@ def _download_mangas(results, check_time, mode_debug=True, logger=None):
         browser = p.chromium.launch(headless=True)
         
         for result in con_nuevos:
-            manga_id = result['manga_id']
-            title = result['title']
-            new_count = result['new_chapters_count']
-            current_chapter = result['current_chapter']
-            last_checked = result['last_checked_chapter']
-            nuevos_caps = result.get('nuevos_capitulos')
-            
-            msg = f"\n{'='*60}"
-            if mode_debug:
-                print(msg)
-            if logger:
-                logger.log(msg)
-            
-            msg = f"DESCARGANDO: {title}"
-            if mode_debug:
-                print(msg)
-            if logger:
-                logger.log(msg)
-            
-            msg = f"{'='*60}"
-            if mode_debug:
-                print(msg)
-            if logger:
-                logger.log(msg)
-            
-            msg = f"Capitulos nuevos: {new_count}"
-            if mode_debug:
-                print(msg)
-            if logger:
-                logger.log(msg)
-            
-            msg = f"Ultimo disponible: {current_chapter}"
-            if mode_debug:
-                print(msg)
-            if logger:
-                logger.log(msg)
-            
-            msg = f"Ultimo descargado: {last_checked}"
-            if mode_debug:
-                print(msg)
-            if logger:
-                logger.log(msg)
-            
-            # OPTIMIZACION: Usar lista si existe
-            if nuevos_caps and len(nuevos_caps) > 0:
-                msg = f"[INFO] Usando lista optimizada ({len(nuevos_caps)} caps)"
-                if mode_debug:
-                    print(msg)
-                if logger:
-                    logger.log(msg)
-                success = download_manga_from_list(manga_id, nuevos_caps, browser, mode_debug=mode_debug, logger=logger)
-            else:
-                # Fallback: metodo tradicional
-                msg = f"[WARN] Sin lista, usando metodo tradicional"
-                if mode_debug:
-                    print(msg)
-                if logger:
-                    logger.log(msg)
-                
-                if last_checked:
-                    try:
-                        start_cap = str(int(float(last_checked)) + 1)
-                    except ValueError:
-                        start_cap = current_chapter
-                else:
-                    start_cap = current_chapter
-                
-                msg = f"[INFO] Descargando desde capitulo {start_cap}"
-                if mode_debug:
-                    print(msg)
-                if logger:
-                    logger.log(msg)
-                
-                # IMPORTANTE: Cerrar browser compartido temporalmente
-                browser.close()
-                success = download_manga(manga_id, start_cap, mode_debug=mode_debug, logger=logger)
-                # Reabrir para siguiente manga
-                browser = p.chromium.launch(headless=True)
-            
-            if success:
-                result['downloaded'] = True
+            browser = _descargar_resultado(result, p, browser, mode_debug=mode_debug, logger=logger)
+            if result['downloaded']:
                 descargados += 1
-            else:
-                result['downloaded'] = False
         
         browser.close()
     
     return results, descargados, check_time
     
 
+def _descargar_resultado(result, p, browser, mode_debug=True, logger=None):
+    """
+    Descargar los capitulos nuevos de un resultado del checker.
+    Marca result['downloaded'] y result['download_time'].
+    Retorna el browser a usar para el siguiente (el fallback lo relanza)
+    """
+    from download_worker import download_manga_from_list, download_manga
+    
+    manga_id = result['manga_id']
+    title = result['title']
+    new_count = result['new_chapters_count']
+    current_chapter = result['current_chapter']
+    last_checked = result['last_checked_chapter']
+    nuevos_caps = result.get('nuevos_capitulos')
+    start_descarga = time.time()
+    
+    msg = f"\n{'='*60}"
+    if mode_debug:
+        print(msg)
+    if logger:
+        logger.log(msg)
+    
+    msg = f"DESCARGANDO: {title}"
+    if mode_debug:
+        print(msg)
+    if logger:
+        logger.log(msg)
+    
+    msg = f"{'='*60}"
+    if mode_debug:
+        print(msg)
+    if logger:
+        logger.log(msg)
+    
+    msg = f"Capitulos nuevos: {new_count}"
+    if mode_debug:
+        print(msg)
+    if logger:
+        logger.log(msg)
+    
+    msg = f"Ultimo disponible: {current_chapter}"
+    if mode_debug:
+        print(msg)
+    if logger:
+        logger.log(msg)
+    
+    msg = f"Ultimo descargado: {last_checked}"
+    if mode_debug:
+        print(msg)
+    if logger:
+        logger.log(msg)
+    
+    # OPTIMIZACION: Usar lista si existe
+    if nuevos_caps and len(nuevos_caps) > 0:
+        msg = f"[INFO] Usando lista optimizada ({len(nuevos_caps)} caps)"
+        if mode_debug:
+            print(msg)
+        if logger:
+            logger.log(msg)
+        success = download_manga_from_list(manga_id, nuevos_caps, browser, mode_debug=mode_debug, logger=logger)
+    else:
+        # Fallback: metodo tradicional
+        msg = f"[WARN] Sin lista, usando metodo tradicional"
+        if mode_debug:
+            print(msg)
+        if logger:
+            logger.log(msg)
+        
+        if last_checked:
+            try:
+                start_cap = str(int(float(last_checked)) + 1)
+            except ValueError:
+                start_cap = current_chapter
+        else:
+            start_cap = current_chapter
+        
+        msg = f"[INFO] Descargando desde capitulo {start_cap}"
+        if mode_debug:
+            print(msg)
+        if logger:
+            logger.log(msg)
+        
+        # IMPORTANTE: Cerrar browser compartido temporalmente
+        browser.close()
+        success = download_manga(manga_id, start_cap, mode_debug=mode_debug, logger=logger)
+        # Reabrir para siguiente manga
+        browser = p.chromium.launch(headless=True)
+    
+    result['downloaded'] = bool(success)
+    result['download_time'] = time.time() - start_descarga
+    
+    return browser
+    
+
 def show_summary(results, descargados, check_time, mode_debug=True, logger=None):
     """Mostrar resumen con info de descargas"""
     nuevos = [r for r in results if r.get('has_new', False)]
@@ -255,6 +366,13 @@ def show_summary(results, descargados, check_time, mode_debug=True, logger=None)
     if logger:
         logger.log(msg)
     
+    # Suma de lo que ha tardado cada manga (en streaming se solapa con el chequeo)
+    download_time = sum(r.get('download_time', 0) for r in results)
+    msg = f"Tiempo descarga: {download_time:.2f}s"
+    print(msg)
+    if logger:
+        logger.log(msg)
+    
     msg = f"Manga con capitulos nuevos: {len(nuevos)}"
     print(msg)
     if logger:
@@ -265,6 +383,12 @@ def show_summary(results, descargados, check_time, mode_debug=True, logger=None)
     if logger:
         logger.log(msg)
     
+    # Aciertos de las caches de respuestas HTTP (p.ej. capitulos de olympus_com)
+    for msg in resumen_caches():
+        print(msg)
+        if logger:
+            logger.log(msg)
+    
     if nuevos:
         msg = "\nLista mangas con nuevos capitulos:"
         print(msg)
@@ -312,7 +436,7 @@ def main():
     try:
         with Logger(log_path, "check_and_download_worker.main") as logger:
             try:
-                results, descargados, check_time = check_and_download(mode_debug=True, logger=logger)
+                results, descargados, check_time = check_and_download(mode_debug=True, logger=logger, streaming=True)
                 show_summary(results, descargados, check_time, mode_debug=True, logger=logger)
                 
             except Exception as e:
@@ -327,6 +451,7 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        http_pool.cerrar_sesiones()
         input("\nPresiona Enter para cerrar...")
 
 if __name__ == "__main__":
@@ -2,14 +2,21 @@
 import sys
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from server.server_utils import regenerar_seccion_seguimiento
 from database.db_manager import DatabaseManager
+from utils.check_scheduler import seleccionar_pendientes
 import importlib.util
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
 
 from utils.logger import Logger, create_log_path
+from utils import http_pool
+from utils.cache_respuestas import resumen_caches
+
+# Resultados por transaccion dentro de cada lane
+LOTE_RESULTADOS = 20
 
 # Mapeo de page_types a clases checker
 CHECKER_CLASSES = {
@@ -75,13 +82,9 @@ def check_single_manga(manga_id, mode_debug=True, logger=None):
         # Cargar checker
         checker_class = get_checker_class(page_type['name'])
         result = checker_class.check_single(manga, mode_debug=mode_debug, logger=logger)
+        db.apply_check_results([result])
         
         if result['has_new']:
-            with db.get_connection() as conn:
-                conn.execute(
-                    'UPDATE manga SET current_chapter = ? WHERE id = ?',
-                    (result['current_chapter'], manga['id'])
-                )
             msg = f"  [NUEVO] Ultimo capitulo: {result['current_chapter']}"
             print(msg)
             if logger:
@@ -114,7 +117,92 @@ def check_single_manga(manga_id, mode_debug=True, logger=None):
         return None
         
     
-def check_all_manga(page_mode=0, mode_debug=True, logger=None):
+def _page_type_permitido(page_type_name, page_mode):
+    """Indica si un page_type entra en el page_mode pedido"""
+    if page_mode == 1:
+        return page_type_name == 'olympus_com'
+    elif page_mode == 2:
+        return page_type_name == 'olympus_net'
+    elif page_mode == 3:
+        return page_type_name == 'tmo'
+    elif page_mode == 4:
+        return page_type_name != 'olympus_com'
+    elif page_mode == 5:
+        return page_type_name == 'animeallstar'
+    return True
+
+def _check_page_type(page_type_name, manga_list, mode_debug=True, logger=None, callback=None):
+    """
+    Lane de un page_type: check_batch. Retorna lista de resultados.
+    Los resultados se guardan en la DB por lotes de LOTE_RESULTADOS (y antes
+    de pasar al callback uno con nuevos), asi un corte a mitad de lane no
+    pierde lo ya chequeado ni descarga algo cuyo check no esta guardado
+    callback: se llama con cada resultado en cuanto el checker lo entrega
+    """
+    results = []
+    sin_guardar = []
+    db = DatabaseManager()
+    
+    def _guardar_lote():
+        if not sin_guardar:
+            return
+        try:
+            db.apply_check_results(sin_guardar)
+        except Exception as e:
+            msg = f"[ERROR] No se pudieron guardar {len(sin_guardar)} resultado(s) de '{page_type_name}': {e}"
+            print(msg)
+            if logger:
+                logger.log(msg)
+        sin_guardar.clear()
+    
+    def _procesar_resultado(result):
+        """Loguear y agregar a results en cuanto el checker lo entrega"""
+        if result['has_new']:
+            msg = f"  [NUEVO] {result['title']}: Cap. {result['current_chapter']} (+{result['new_chapters_count']})"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+        else:
+            msg = f"  [OK] {result['title']}: Sin nuevos"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+        
+        results.append(result)
+        sin_guardar.append(result)
+        if result['has_new'] or len(sin_guardar) >= LOTE_RESULTADOS:
+            _guardar_lote()
+        
+        if callback:
+            callback(result)
+    
+    try:
+        checker_class = get_checker_class(page_type_name)
+        
+        msg = f"\n[BATCH] Chequeando {len(manga_list)} manga(s) de '{page_type_name}'..."
+        if mode_debug:
+            print(msg)
+        if logger:
+            logger.log(msg)
+        
+        checker_class.check_batch(manga_list, mode_debug=mode_debug, logger=logger, callback=_procesar_resultado)
+    
+    except Exception as e:
+        msg = f"[ERROR] Error procesando page_type '{page_type_name}': {e}"
+        print(msg)
+        if logger:
+            logger.log(msg)
+            import traceback
+            logger.log(traceback.format_exc())
+        import traceback
+        traceback.print_exc()
+    
+    _guardar_lote()
+    return results
+
+def check_all_manga(page_mode=0, mode_debug=True, logger=None, paralelo=True, callback=None, incremental=False):
     """
     Page Mode = 0 -> Todos los tipos de paginas
     Page Mode = 1 -> Solo Olympus_Com
@@ -122,6 +210,13 @@ def check_all_manga(page_mode=0, mode_debug=True, logger=None):
     Page Mode = 3 -> Solo TMO
     Page Mode = 4 -> Todos menos Olympus_Com
     Page Mode = 5 -> Solo Anime All Star
+    
+    paralelo=True -> cada page_type se chequea en su propio hilo,
+    el tiempo total es el de la pagina mas lenta y no la suma
+    callback -> se llama con cada resultado en cuanto su lane lo entrega
+    (check_and_download lo usa para descargar sin esperar al resto)
+    incremental=True -> solo los titulos que "tocan" segun su ritmo de
+    publicacion (utils/check_scheduler), ordenados por probabilidad de novedad
     """
     db = DatabaseManager()
     all_manga = db.get_manga_by_tracking(1)    
@@ -133,6 +228,15 @@ def check_all_manga(page_mode=0, mode_debug=True, logger=None):
             logger.log(msg)
         return [], 0
     
+    if incremental:
+        all_manga = seleccionar_pendientes(all_manga, db.get_new_chapter_history(), mode_debug=mode_debug, logger=logger)
+        if not all_manga:
+            msg = "\n[INFO] Ningun manga pendiente de chequeo"
+            print(msg)
+            if logger:
+                logger.log(msg)
+            return [], 0
+    
     msg = f"\nIniciando verificacion de {len(all_manga)} manga..."
     if mode_debug:
         print(msg)
@@ -162,70 +266,32 @@ def check_all_manga(page_mode=0, mode_debug=True, logger=None):
         if logger:
             logger.log(msg)
     
+    # Filtrar grupos segun page_mode
+    grupos = [(pt_name, manga_list) for pt_name, manga_list in mangas_por_tipo.items()
+              if _page_type_permitido(pt_name, page_mode)]
+    
     results = []
     start_total = time.time()
     
-    # Procesar por grupos con batch
-    for page_type_name, manga_list in mangas_por_tipo.items():
-        try:
-            if page_mode == 1:
-                if page_type_name == 'olympus_net' or page_type_name == 'tmo' or page_type_name == 'animeallstar':
-                    continue
-            elif page_mode == 2:
-                if page_type_name == 'olympus_com' or page_type_name == 'tmo' or page_type_name == 'animeallstar':
-                    continue
-            elif page_mode == 3:
-                if page_type_name == 'olympus_com' or page_type_name == 'olympus_net' or page_type_name == 'animeallstar':
-                    continue
-            elif page_mode == 4:
-                if page_type_name == 'olympus_com':
-                    continue
-            elif page_mode == 5:
-                if page_type_name == 'olympus_net' or page_type_name == 'tmo' or page_type_name == 'olympus_com':
-                    continue
-            
-            checker_class = get_checker_class(page_type_name)
-            
-            msg = f"\n[BATCH] Chequeando {len(manga_list)} manga(s) de '{page_type_name}'..."
-            if mode_debug:
-                print(msg)
-            if logger:
-                logger.log(msg)
-            
-            batch_results = checker_class.check_batch(manga_list, mode_debug=mode_debug, logger=logger)
-            
-            # Actualizar DB y agregar a results
-            for result in batch_results:
-                if result['has_new']:
-                    with db.get_connection() as conn:
-                        conn.execute(
-                            'UPDATE manga SET current_chapter = ? WHERE id = ?',
-                            (result['current_chapter'], result['manga_id'])
-                        )
-                    msg = f"  [NUEVO] {result['title']}: Cap. {result['current_chapter']} (+{result['new_chapters_count']})"
-                    if mode_debug:
-                        print(msg)
-                    if logger:
-                        logger.log(msg)
-                else:
-                    msg = f"  [OK] {result['title']}: Sin nuevos"
-                    if mode_debug:
-                        print(msg)
-                    if logger:
-                        logger.log(msg)
-                
-                results.append(result)
-        
-        except Exception as e:
-            msg = f"[ERROR] Error procesando page_type '{page_type_name}': {e}"
+    if paralelo and len(grupos) > 1:
+        # Una lane por pagina: cada check_batch mantiene su propio ritmo
+        msg = f"[SCHEDULER] Lanzando {len(grupos)} lane(s) en paralelo"
+        if mode_debug:
             print(msg)
-            if logger:
-                logger.log(msg)
-                import traceback
-                logger.log(traceback.format_exc())
-            import traceback
-            traceback.print_exc()
-            continue
+        if logger:
+            logger.log(msg)
+        
+        with ThreadPoolExecutor(max_workers=len(grupos), thread_name_prefix='check') as pool:
+            futuros = [
+                pool.submit(_check_page_type, pt_name, manga_list, mode_debug, logger, callback)
+                for pt_name, manga_list in grupos
+            ]
+            # Mezclar en el orden original de los grupos
+            for futuro in futuros:
+                results.extend(futuro.result())
+    else:
+        for page_type_name, manga_list in grupos:
+            results.extend(_check_page_type(page_type_name, manga_list, mode_debug, logger, callback))
     
     total_time = time.time() - start_total
     return results, total_time
@@ -255,6 +321,12 @@ def show_summary(results, total_time, mode_debug=True, logger=None):
     if logger:
         logger.log(msg)
     
+    # Aciertos de las caches de respuestas HTTP (p.ej. capitulos de olympus_com)
+    for msg in resumen_caches():
+        print(msg)
+        if logger:
+            logger.log(msg)
+    
     if nuevos:
         msg = "\nNUEVOS CAPITULOS:"
         print(msg)
@@ -334,6 +406,7 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        http_pool.cerrar_sesiones()
         input("\nPresiona Enter para cerrar...")
 
 if __name__ == "__main__":
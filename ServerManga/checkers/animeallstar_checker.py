@@ -1,7 +1,8 @@
 from checkers.base_checker import BaseChecker
-import requests
+from utils import http_pool
 from bs4 import BeautifulSoup
 import re
+from utils.rate_limiter import get_limiter
 
 class AnimeAllStarChecker(BaseChecker):
     
@@ -19,13 +20,11 @@ class AnimeAllStarChecker(BaseChecker):
         if logger:
             logger.log(msg)
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Referer': 'https://animeallstar30.com/'
-        }
-
         try:
-            response = requests.get(check_url, headers=headers, timeout=15)
+            limiter = get_limiter('animeallstar', check_url)
+            limiter.esperar()
+            response = http_pool.get(check_url, 'animeallstar', timeout=15)
+            limiter.registrar_respuesta(response, mode_debug=mode_debug, logger=logger)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -161,12 +160,10 @@ class AnimeAllStarChecker(BaseChecker):
         }
     
     @staticmethod
-    def check_batch(manga_list, mode_debug=True, logger=None):
+    def check_batch(manga_list, mode_debug=True, logger=None, callback=None):
         """Batch processing para animeallstar"""
         resultados = []
         for manga in manga_list:
             result = AnimeAllStarChecker.check_single(manga, mode_debug, logger)
-            resultados.append(result)
-            import time
-            time.sleep(2) # Respetar rate limits
+            BaseChecker._agregar_resultado(resultados, callback, result)
         return resultados
\ No newline at end of file
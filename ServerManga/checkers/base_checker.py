@@ -18,8 +18,16 @@ class BaseChecker(ABC):
 
     @staticmethod
     @abstractmethod
-    def check_batch(manga_list, mode_debug=True, logger=None):
+    def check_batch(manga_list, mode_debug=True, logger=None, callback=None):
         """
+        callback: funcion opcional llamada con cada resultado en cuanto esta listo
         return: list[dict] (mismo formato que check_single)
         """
-        pass
\ No newline at end of file
+        pass
+
+    @staticmethod
+    def _agregar_resultado(resultados, callback, resultado):
+        """Agregar resultado al batch y notificarlo al callback (si existe)"""
+        resultados.append(resultado)
+        if callback:
+            callback(resultado)
\ No newline at end of file
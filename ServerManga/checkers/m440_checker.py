@@ -2,8 +2,8 @@ from checkers.base_checker import BaseChecker
 from playwright.sync_api import sync_playwright
 import re
 import json
-import time
 import os
+from utils.rate_limiter import get_limiter
 
 class M440Checker(BaseChecker):
     
@@ -18,7 +18,7 @@ class M440Checker(BaseChecker):
                 browser.close()
 
     @staticmethod
-    def check_batch(manga_list, mode_debug=True, logger=None):
+    def check_batch(manga_list, mode_debug=True, logger=None, callback=None):
         """Batch processing"""
         resultados = []
         with sync_playwright() as p:
@@ -26,13 +26,13 @@ class M440Checker(BaseChecker):
             for manga in manga_list:
                 try:
                     res = M440Checker._process_manga(manga, browser, mode_debug, logger)
-                    resultados.append(res)
+                    BaseChecker._agregar_resultado(resultados, callback, res)
                 except Exception as e:
                     msg = f"[ERROR BATCH] Fallo procesando {manga['title']}: {e}"
                     print(msg)
                     if logger: logger.log(msg)
-                    resultados.append(M440Checker._empty_result(manga['id'], manga['title'], manga.get('last_checked_chapter')))
-                time.sleep(2)
+                    BaseChecker._agregar_resultado(resultados, callback, M440Checker._empty_result(manga['id'], manga['title'], manga.get('last_checked_chapter')))
+                get_limiter('m440').esperar()
             browser.close()
         return resultados
 
@@ -1,12 +1,43 @@
-import requests
-import time
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import http_pool
+from utils.cache_respuestas import get_cache
+from utils.emparejador_nombres import EmparejadorNombres, normalizar_nombre
+from utils.rate_limiter import get_limiter
+
+PATRON_NUMERO_CAPITULO = re.compile(r'\d+(?:\.\d+)?')
 
 class OlympusComAPIClient:
     BASE_URL = "https://olympusbiblioteca.com/api/series"
     
+    # Aceptar el nombre mas parecido (trigramas) si no hay coincidencia exacta.
+    # Desactivado por defecto: un parecido puede ser otra serie; si se activa,
+    # los slugs aproximados se validan y se marcan [DIFUSO] en el log
+    BUSQUEDA_DIFUSA = False
+    
+    # Recorridos del catalogo: paginas descargandose a la vez (el rate limiter
+    # del host sigue marcando el ritmo) y tope de peticiones por recorrido
+    CATALOGO_CONCURRENCIA = 3
+    CATALOGO_PRESUPUESTO = None   # None = sin tope
+    
+    # Respuestas de /chapters en disco: dentro del TTL no se pregunta al
+    # servidor; despues se revalida con ETag/Last-Modified (304 = sin cambios)
+    CACHE_CAPITULOS_TTL = 600
+    
     def __init__(self):
-        self.session = requests.Session()
         self._page_cache = {}
+        self._catalogo_actualizado = False
+    
+    def get(self, url, **kwargs):
+        """GET con rate limit adaptativo por host (el catalogo /api/series lleva su propio ritmo)"""
+        tipo_limite = 'olympus_catalogo' if url.startswith(self.BASE_URL) else 'olympus_com'
+        limiter = get_limiter(tipo_limite, url)
+        limiter.esperar()
+        response = http_pool.get(url, 'olympus_com', **kwargs)
+        limiter.registrar_respuesta(response, espera_json='/api/' in url)
+        return response
     
     
     #####################################################################################
@@ -16,7 +47,7 @@ class OlympusComAPIClient:
     
     def obtener_capitulos(self, slug, page=1, direction='desc'):
         """
-        Obtener capitulos de una serie por slug
+        Obtener capitulos de una serie por slug (con cache en disco, ver CACHE_CAPITULOS_TTL)
         """
         url = f"https://dashboard.olympusbiblioteca.com/api/series/{slug}/chapters"
         params = {
@@ -24,16 +55,31 @@ class OlympusComAPIClient:
             "direction": direction,
             "type": "comic"
         }
-        time.sleep(2)
+        
+        cache = get_cache('olympus_capitulos', self.CACHE_CAPITULOS_TTL)
+        entrada = cache.leer(url, params)
+        if cache.fresca(entrada):
+            cache.contar('frescas')
+            return entrada['datos']
         
         try:
-            response = self.session.get(url, params=params, timeout=60)
-            print(response)
+            response = self.get(url, params=params, headers=cache.cabeceras_condicionales(entrada), timeout=60)
+            
+            if response.status_code == 304 and entrada:
+                cache.renovar(entrada)
+                cache.contar('revalidadas')
+                return entrada['datos']
+            
             if 'text/html' in response.headers.get('Content-Type', ''):
                 print(f"[ERROR] Cloudflare bloqueo: {slug}")
                 return None
             
-            return response.json()
+            datos = response.json()
+            cache.contar('descargadas')
+            if response.status_code == 200 and 'data' in datos:
+                cache.guardar(url, params, datos,
+                              response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return datos
         except Exception as e:
             print(f"[ERROR] obtener_capitulos: {e}")
             return None
@@ -70,7 +116,6 @@ class OlympusComAPIClient:
         # Paginar si hay mas
         if last_page > 1:
             for page in range(2, last_page + 1):
-                time.sleep(5)
                 page_data = self.obtener_capitulos(slug, page=page, direction=direction)
                 
                 if page_data and 'data' in page_data:
@@ -94,54 +139,87 @@ class OlympusComAPIClient:
             'capitulos': capitulos
         }
         
-    def obtener_nuevos_capitulos(self, slug, num_capitulo, direction='desc', mode_debug=False, logger=None):
-        """Obtener TODOS los capitulos nuevos, paginando automaticamente"""
-        msg = f"[DEBUG] Obteniendo capitulos {num_capitulo} y slug '{slug}'..."
+    @staticmethod
+    def numero_capitulo(nombre):
+        """'12', '12.00', 'Capitulo 12.5' -> 12.0 / 12.5 (None si no hay numero)"""
+        if nombre is None:
+            return None
+        m = PATRON_NUMERO_CAPITULO.search(str(nombre))
+        return float(m.group()) if m else None
+    
+    def buscar_nuevos_capitulos(self, slug, marca_id=None, marca_num=None, mode_debug=False, logger=None):
+        """
+        Capitulos posteriores a la marca (id + numero del ultimo capitulo que
+        tenemos), de mas nuevo a mas viejo. Se recorre en desc y se para en el
+        primer capitulo con ese id o con numero <= marca_num, asi lo normal es
+        una sola pagina aunque el nombre venga con otro formato ("12" / "12.00")
+        o el capitulo de la marca se haya borrado.
+        Retorna (nuevos, marca): marca es {'id', 'num'} para guardar en BD
+        (el id se aprende al encontrar el capitulo con el mismo numero).
+        (None, None) si la API falla
+        """
+        msg = f"[DEBUG] Obteniendo capitulos > {marca_num} (id {marca_id}) y slug '{slug}'..."
         if mode_debug:
             print(msg)
         if logger:
             logger.log(msg)
         
-        data = self.obtener_capitulos(slug, page=1, direction=direction)
-        
-        if not data or 'data' not in data:
-            msg = "[ERROR] No se pudieron obtener capitulos"
-            print(msg)
-            if logger:
-                logger.log(msg)
-            return None
-        
-        capitulos = data['data']
-        meta = data.get('meta', {})
-        last_page = meta.get('last_page', 1)
-        total = meta.get('total', len(capitulos))
         nuevos_capitulos = []
+        marca = {'id': marca_id, 'num': marca_num}
+        page = 1
+        last_page = 1
         
-        for capitulo in capitulos:
-            if capitulo['name'] == num_capitulo:
-                if mode_debug:
-                    print(nuevos_capitulos)
+        while page <= last_page:
+            data = self.obtener_capitulos(slug, page=page, direction='desc')
+            
+            if not data or 'data' not in data:
+                msg = f"[ERROR] No se pudieron obtener capitulos (pagina {page})"
+                print(msg)
                 if logger:
-                    logger.log(str(nuevos_capitulos))
-                return nuevos_capitulos
-            else:
+                    logger.log(msg)
+                return None, None
+            
+            last_page = data.get('meta', {}).get('last_page', 1)
+            
+            for capitulo in data['data']:
+                numero = self.numero_capitulo(capitulo.get('name'))
+                
+                es_marca = marca_id is not None and capitulo.get('id') == marca_id
+                if es_marca or (numero is not None and marca_num is not None and numero <= marca_num):
+                    if numero == marca_num:
+                        marca['id'] = capitulo.get('id')
+                    
+                    msg = f"[DEBUG] {len(nuevos_capitulos)} capitulo(s) nuevo(s), parada en '{capitulo.get('name')}' (pagina {page})"
+                    if mode_debug:
+                        print(msg)
+                    if logger:
+                        logger.log(msg)
+                    return nuevos_capitulos, marca
+                
                 nuevos_capitulos.append(capitulo)
             
-        if last_page > 1:
-            for page in range(2, last_page + 1):
-                time.sleep(5)
-                page_data = self.obtener_capitulos(slug, page=page, direction=direction)
-                capitulos = page_data['data']
-                for capitulo in capitulos:  
-                    if capitulo['name'] == num_capitulo:
-                        if mode_debug:
-                            print(nuevos_capitulos)
-                        if logger:
-                            logger.log(str(nuevos_capitulos))
-                        return nuevos_capitulos
-                    else:
-                        nuevos_capitulos.append(capitulo)   
-                        
+            page += 1
+        
+        # Sin marca (o todos los capitulos son posteriores): toda la serie es nueva
+        msg = f"[DEBUG] Marca no alcanzada: {len(nuevos_capitulos)} capitulo(s) nuevo(s)"
+        if mode_debug:
+            print(msg)
+        if logger:
+            logger.log(msg)
+        return nuevos_capitulos, marca
+    
+    def obtener_nuevos_capitulos(self, slug, num_capitulo, direction='desc', mode_debug=False, logger=None):
+        """
+        Capitulos posteriores a num_capitulo (comparacion numerica, ver
+        buscar_nuevos_capitulos). direction='asc' los devuelve de mas viejo a mas nuevo
+        """
+        nuevos, _ = self.buscar_nuevos_capitulos(
+            slug, marca_num=self.numero_capitulo(num_capitulo), mode_debug=mode_debug, logger=logger
+        )
+        if nuevos is not None and direction == 'asc':
+            nuevos.reverse()
+        return nuevos
+    
     def obtener_ultimo_capitulo(self, slug, mode_debug=False, logger=None):
         """Obtener SOLO el ultimo capitulo (pagina 1)"""
         try:
@@ -168,19 +246,223 @@ class OlympusComAPIClient:
         return f"https://olympusbiblioteca.com/capitulo/{chapter_id}/comic-{slug}"
 
     
+    #####################################################################################
+    #                               CATALOGO LOCAL                                      #
+    #####################################################################################
+    
+    def _descargar_series(self, direction, page):
+        """Bloque 'series' de una pagina de /api/series (lanza excepcion si no viene)"""
+        params = {'type': 'comic', 'direction': direction, 'page': page}
+        response = self.get(self.BASE_URL, params=params, timeout=30)
+        series_block = self._extraer_series(response.json())
+        if not series_block:
+            raise ValueError(f"Respuesta sin series en pagina {page}")
+        return series_block
+    
+    def _recorrer_paginas(self, trabajos, procesar, mode_debug=False, logger=None):
+        """
+        Descargar paginas del catalogo de CATALOGO_CONCURRENCIA en
+        CATALOGO_CONCURRENCIA y procesarlas en el orden de 'trabajos'.
+        trabajos: iterable de (direction, page); se consume segun hace falta,
+                  asi un generador puede saltarse lo que ya no se busca
+        procesar(direction, page, series_block): series_block es None si la
+                  pagina fallo; retorna True para parar (todo encontrado)
+        Retorna el numero de peticiones lanzadas
+        """
+        concurrencia = max(1, self.CATALOGO_CONCURRENCIA)
+        presupuesto = self.CATALOGO_PRESUPUESTO
+        trabajos = iter(trabajos)
+        en_vuelo = deque()
+        peticiones = 0
+        
+        with ThreadPoolExecutor(max_workers=concurrencia, thread_name_prefix='catalogo') as pool:
+            
+            def lanzar():
+                nonlocal peticiones
+                while len(en_vuelo) < concurrencia:
+                    if presupuesto is not None and peticiones >= presupuesto:
+                        return
+                    trabajo = next(trabajos, None)
+                    if trabajo is None:
+                        return
+                    en_vuelo.append((trabajo, pool.submit(self._descargar_series, *trabajo)))
+                    peticiones += 1
+            
+            lanzar()
+            while en_vuelo:
+                (direction, page), futuro = en_vuelo.popleft()
+                try:
+                    series_block = futuro.result()
+                except Exception as e:
+                    msg = f"[ERROR] Fallo en {direction.upper()} pagina {page}: {e}"
+                    if logger:
+                        logger.log(msg)
+                    series_block = None
+                
+                if procesar(direction, page, series_block):
+                    for _, pendiente in en_vuelo:
+                        pendiente.cancel()
+                    en_vuelo.clear()
+                    break
+                lanzar()
+        
+        if presupuesto is not None and peticiones >= presupuesto:
+            msg = f"[CATALOGO] Presupuesto de {presupuesto} peticiones agotado"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+        
+        return peticiones
+    
+    @staticmethod
+    def _filas_catalogo(series_block):
+        """Bloque 'series' -> filas para olympus_catalogo"""
+        return [
+            (OlympusComAPIClient._normalizar_nombre(serie['name']), serie.get('id'),
+             serie['name'], serie.get('slug'), serie.get('cover'))
+            for serie in series_block['data']
+        ]
+    
+    def _pagina_catalogo(self, page):
+        """Pagina DESC de /api/series -> (filas para olympus_catalogo, last_page)"""
+        series_block = self._descargar_series('desc', page)
+        return self._filas_catalogo(series_block), series_block.get('last_page', page)
+    
+    def actualizar_catalogo(self, mode_debug=False, logger=None):
+        """
+        Refrescar el catalogo local (tabla olympus_catalogo), una vez por proceso.
+        Primera vez: recorre todo /api/series (reanudable si se corta).
+        Despues: solo las paginas mas nuevas, hasta una pagina sin novedades
+        """
+        from database.db_manager import DatabaseManager
+        
+        if self._catalogo_actualizado:
+            return True
+        
+        db = DatabaseManager()
+        db.add_olympus_catalogo_table()
+        estado = db.get_olympus_catalogo_estado()
+        
+        # Carga completa (o continuarla donde se quedo)
+        if not estado['completo']:
+            page = estado['ultima_pagina'] + 1
+            
+            msg = f"[CATALOGO] Carga completa desde pagina {page}..."
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+            
+            try:
+                filas, last_page = self._pagina_catalogo(page)
+            except Exception as e:
+                msg = f"[ERROR] Catalogo pagina {page}: {e}"
+                print(msg)
+                if logger:
+                    logger.log(msg)
+                return False
+            
+            db.upsert_olympus_catalogo(filas)
+            db.update_olympus_catalogo_estado(False, page)
+            
+            # Resto de paginas en paralelo; se guardan en orden para que
+            # ultima_pagina siga sirviendo para reanudar
+            fallo = []
+            
+            def guardar_pagina(direction, page, series_block):
+                if series_block is None:
+                    fallo.append(page)
+                    return True
+                
+                db.upsert_olympus_catalogo(self._filas_catalogo(series_block))
+                db.update_olympus_catalogo_estado(False, page)
+                
+                if page % 10 == 0:
+                    msg = f"[CATALOGO] Progreso: {page}/{last_page}"
+                    if mode_debug:
+                        print(msg)
+                    if logger:
+                        logger.log(msg)
+                return False
+            
+            self._recorrer_paginas(
+                (('desc', p) for p in range(page + 1, last_page + 1)),
+                guardar_pagina, mode_debug=mode_debug, logger=logger
+            )
+            
+            if fallo:
+                msg = f"[ERROR] Catalogo pagina {fallo[0]}: carga interrumpida"
+                print(msg)
+                if logger:
+                    logger.log(msg)
+                return False
+            
+            if db.get_olympus_catalogo_estado()['ultima_pagina'] < last_page:
+                # Presupuesto agotado: se sigue en la proxima ejecucion
+                return False
+            
+            db.update_olympus_catalogo_estado(True, last_page)
+        
+        # Incremental: paginas nuevas hasta una sin cambios
+        page = 1
+        last_page = 1
+        cambios_total = 0
+        
+        while page <= last_page:
+            try:
+                filas, last_page = self._pagina_catalogo(page)
+            except Exception as e:
+                msg = f"[ERROR] Catalogo pagina {page}: {e}"
+                print(msg)
+                if logger:
+                    logger.log(msg)
+                return False
+            
+            cambios = db.upsert_olympus_catalogo(filas)
+            cambios_total += cambios
+            if cambios == 0:
+                break
+            page += 1
+        
+        msg = f"[CATALOGO] Actualizado: {cambios_total} serie(s) nuevas/cambiadas en {min(page, last_page)} pagina(s)"
+        if mode_debug:
+            print(msg)
+        if logger:
+            logger.log(msg)
+        
+        self._catalogo_actualizado = True
+        return True
+    
+    def buscar_en_catalogo(self, titulo):
+        """Serie del catalogo local con el mismo nombre normalizado (sin HTTP)"""
+        from database.db_manager import DatabaseManager
+        
+        db = DatabaseManager()
+        return db.get_olympus_catalogo(OlympusComAPIClient._normalizar_nombre(titulo))
+    
+    
     #####################################################################################
     #                               ACTUALIZAR SLUGS                                    #                            
     #####################################################################################
     def buscar_serie(self, nombre, max_pages=999, logger=None):
         nombre = nombre.lower()
         
+        # Catalogo local primero
+        if self.actualizar_catalogo(logger=logger):
+            from database.db_manager import DatabaseManager
+            
+            fila = DatabaseManager().buscar_olympus_catalogo(nombre)
+            if fila:
+                return {'id': fila['serie_id'], 'name': fila['nombre'], 'slug': fila['slug'], 'cover': fila['cover']}
+        
         params = {
             "type": "comic",
             "direction": "desc",
             "page": 1
         }
         
-        response = self.session.get(self.BASE_URL, params=params, timeout=10)
+        response = self.get(self.BASE_URL, params=params, timeout=10)
         data = response.json()
         
         series_block = self._extraer_series(data)
@@ -192,8 +474,7 @@ class OlympusComAPIClient:
         for page in range(1, last_page + 1):
             if page > 1:
                 params["page"] = page
-                time.sleep(3)
-                response = self.session.get(self.BASE_URL, params=params, timeout=10)
+                response = self.get(self.BASE_URL, params=params, timeout=10)
                 data = response.json()
                 series_block = self._extraer_series(data)
                 if not series_block:
@@ -266,6 +547,40 @@ class OlympusComAPIClient:
                 logger.log(msg)
             return resultados
         
+        # FASE 1b: Catalogo local (sin paginar la API)
+        msg = f"\n[CATALOGO] Buscando {len(pendientes)} manga(s) en catalogo local..."
+        if mode_debug:
+            print(msg)
+        if logger:
+            logger.log(msg)
+        
+        if self.actualizar_catalogo(mode_debug=mode_debug, logger=logger):
+            sin_catalogo = []
+            
+            for manga in pendientes:
+                fila = self.buscar_en_catalogo(manga['title'])
+                
+                if fila and fila['slug'] and self._validar_slug_construido(fila['slug'], logger=logger):
+                    resultados[manga['id']] = {'serie': {'slug': fila['slug'], 'cover': fila['cover']}}
+                    
+                    msg = f"  [FOUND] '{manga['title']}' slug: {fila['slug']} (catalogo)"
+                    if mode_debug:
+                        print(msg)
+                    if logger:
+                        logger.log(msg)
+                else:
+                    sin_catalogo.append(manga)
+            
+            pendientes = sin_catalogo
+        
+        if not pendientes:
+            msg = f"\n[FINAL] Busqueda completada: {len(resultados)}/{len(manga_info_list)} encontrados"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+            return resultados
+        
         # FASE 2: Separar con/sin cache
         msg = f"\n[FASE 2] Verificando cache para {len(pendientes)} manga(s)..."
         if mode_debug:
@@ -383,7 +698,7 @@ class OlympusComAPIClient:
             try:
                 url = "https://olympusbiblioteca.com/api/series"
                 params = {'type': 'comic', 'direction': direction, 'page': page}
-                response = self.session.get(url, params=params, timeout=30)
+                response = self.get(url, params=params, timeout=30)
                 data = response.json()
                 series_list = data['data']['series']['data']
                 
@@ -397,95 +712,99 @@ class OlympusComAPIClient:
                 reinicializar.extend(manga_grupo)
                 continue
             
-            # Buscar cada manga del grupo en esta pagina
+            # Emparejar por diccionario: cada nombre de la pagina se normaliza una vez
+            emparejador = EmparejadorNombres({m['id']: m['title'] for m in manga_grupo})
+            encontrados = emparejador.emparejar_pagina(series_list, difuso=self.BUSQUEDA_DIFUSA)
+            
             for manga in manga_grupo:
-                encontrado = False
-                nombre_buscar = OlympusComAPIClient._normalizar_nombre(manga['title'])
+                serie = encontrados.get(manga['id'])
+                encontrado = serie is not None
+                nombre_buscar = normalizar_nombre(serie['name']) if serie else None
                 
-                for serie in series_list:
-                    nombre_serie = OlympusComAPIClient._normalizar_nombre(serie['name'])
-                    if nombre_serie == nombre_buscar:
-                        encontrado = True
-                        slug = serie['slug']
+                if encontrado:
+                    slug = serie['slug']
+                    
+                    msg = f"  [FOUND] '{manga['title']}' slug: {slug}"
+                    if mode_debug:
+                        print(msg)
+                    if logger:
+                        logger.log(msg)
+                    
+                    if manga['id'] not in emparejador.exactos(serie['name']):
+                        msg = f"  [DIFUSO] '{manga['title']}' ~ '{serie['name']}'"
+                        print(msg)
+                        if logger:
+                            logger.log(msg)
+                    
+                    # Validar slug
+                    if self._validar_slug_construido(slug, logger=logger):
+                        msg = f"  [OK] Slug valido"
+                        if mode_debug:
+                            print(msg)
+                        if logger:
+                            logger.log(msg)
                         
-                        msg = f"  [FOUND] '{manga['title']}' slug: {slug}"
+                        resultados[manga['id']] = {'serie': {'slug': slug}}
+                    else:
+                        msg = f"  [INVALIDO] Slug invalido, probando direction contrario"
                         if mode_debug:
                             print(msg)
                         if logger:
                             logger.log(msg)
                         
-                        # Validar slug
-                        if self._validar_slug_construido(slug, logger=logger):
-                            msg = f"  [OK] Slug valido"
-                            if mode_debug:
-                                print(msg)
-                            if logger:
-                                logger.log(msg)
-                            
-                            resultados[manga['id']] = {'serie': {'slug': slug}}
+                        # Probar direction contrario
+                        direction_contrario = 'asc' if direction == 'desc' else 'desc'
+                        
+                        if direction_contrario == 'asc':
+                            page_contrario = manga['cache']['last_search_asc_page']
                         else:
-                            msg = f"  [INVALIDO] Slug invalido, probando direction contrario"
+                            page_contrario = manga['cache']['last_search_desc_page']
+                        
+                        try:
+                            params_contrario = {'type': 'comic', 'direction': direction_contrario, 'page': page_contrario}
+                            response_contrario = self.get(url, params=params_contrario, timeout=30)
+                            data_contrario = response_contrario.json()
+                            series_contrario = data_contrario['data']['series']['data']
+                            
+                            msg = f"  [GRUPO] Procesando pagina contraria {page_contrario} {direction_contrario.upper()}"
                             if mode_debug:
                                 print(msg)
                             if logger:
                                 logger.log(msg)
                             
-                            # Probar direction contrario
-                            direction_contrario = 'asc' if direction == 'desc' else 'desc'
-                            
-                            if direction_contrario == 'asc':
-                                page_contrario = manga['cache']['last_search_asc_page']
-                            else:
-                                page_contrario = manga['cache']['last_search_desc_page']
-                            
-                            try:
-                                params_contrario = {'type': 'comic', 'direction': direction_contrario, 'page': page_contrario}
-                                response_contrario = self.session.get(url, params=params_contrario, timeout=30)
-                                data_contrario = response_contrario.json()
-                                series_contrario = data_contrario['data']['series']['data']
-                                
-                                msg = f"  [GRUPO] Procesando pagina contraria {page_contrario} {direction_contrario.upper()}"
-                                if mode_debug:
-                                    print(msg)
-                                if logger:
-                                    logger.log(msg)
-                                
-                                for serie_contrario in series_contrario:
-                                    nombre_serie_contrario = OlympusComAPIClient._normalizar_nombre(serie_contrario['name'])
-                                    if nombre_serie_contrario == nombre_buscar:
-                                        slug_contrario = serie_contrario['slug']
-                                        
-                                        msg = f"  [FOUND] '{manga['title']}' slug: {slug_contrario}"
+                            for serie_contrario in series_contrario:
+                                if normalizar_nombre(serie_contrario['name']) == nombre_buscar:
+                                    slug_contrario = serie_contrario['slug']
+                                    
+                                    msg = f"  [FOUND] '{manga['title']}' slug: {slug_contrario}"
+                                    if mode_debug:
+                                        print(msg)
+                                    if logger:
+                                        logger.log(msg)
+                                    
+                                    if self._validar_slug_construido(slug_contrario, logger=logger):
+                                        msg = f"  [OK] Slug valido en {direction_contrario.upper()}"
                                         if mode_debug:
                                             print(msg)
                                         if logger:
                                             logger.log(msg)
                                         
-                                        if self._validar_slug_construido(slug_contrario, logger=logger):
-                                            msg = f"  [OK] Slug valido en {direction_contrario.upper()}"
-                                            if mode_debug:
-                                                print(msg)
-                                            if logger:
-                                                logger.log(msg)
-                                            
-                                            resultados[manga['id']] = {'serie': {'slug': slug_contrario}}
-                                            
-                                            # Actualizar direction valido
-                                            db.update_olympus_cache_direction(manga['id'], direction_contrario)
-                                        else:
-                                            msg = f"  [ERROR] Ambos slugs invalidos"
-                                            print(msg)
-                                            if logger:
-                                                logger.log(msg)
+                                        resultados[manga['id']] = {'serie': {'slug': slug_contrario}}
                                         
-                                        break
-                            
-                            except Exception as e:
-                                msg = f"  [ERROR] Fallo buscando en {direction_contrario}: {e}"
-                                if logger:
-                                    logger.log(msg)
+                                        # Actualizar direction valido
+                                        db.update_olympus_cache_direction(manga['id'], direction_contrario)
+                                    else:
+                                        msg = f"  [ERROR] Ambos slugs invalidos"
+                                        print(msg)
+                                        if logger:
+                                            logger.log(msg)
+                                    
+                                    break
                         
-                        break
+                        except Exception as e:
+                            msg = f"  [ERROR] Fallo buscando en {direction_contrario}: {e}"
+                            if logger:
+                                logger.log(msg)
                 
                 if not encontrado:
                     msg = f"  [NO ENCONTRADO] '{manga['title']}' no en pagina {page} {direction}, requiere reinicializacion"
@@ -531,25 +850,32 @@ class OlympusComAPIClient:
                 try:
                     url = "https://olympusbiblioteca.com/api/series"
                     params = {'type': 'comic', 'direction': direction, 'page': page}
-                    response = self.session.get(url, params=params, timeout=30)
+                    response = self.get(url, params=params, timeout=30)
                     data = response.json()
                     series_list = data['data']['series']['data']
                     
-                    nombre_buscar = manga['title'].lower()
+                    emparejador = EmparejadorNombres({manga['id']: manga['title']})
+                    serie = emparejador.emparejar_pagina(series_list, difuso=self.BUSQUEDA_DIFUSA).get(manga['id'])
                     
-                    nombre_buscar = OlympusComAPIClient._normalizar_nombre(manga['title'])
+                    if serie and manga['id'] not in emparejador.exactos(serie['name']):
+                        msg = f"[DIFUSO] '{manga['title']}' ~ '{serie['name']}'"
+                        print(msg)
+                        if logger:
+                            logger.log(msg)
                     
-                    for serie in series_list:
-                        nombre_serie = OlympusComAPIClient._normalizar_nombre(serie['name'])
-                        if nombre_serie == nombre_buscar:
-                            resultados[manga['id']] = {'serie': {'slug': serie['slug']}}
-                            
-                            msg = f"[OK] '{manga['title']}' slug obtenido tras reinicializacion"
-                            if mode_debug:
-                                print(msg)
-                            if logger:
-                                logger.log(msg)
-                            break
+                    if serie and not self._validar_slug_construido(serie['slug'], logger=logger):
+                        msg = f"[INVALIDO] '{manga['title']}' slug '{serie['slug']}' invalido tras reinicializacion"
+                        print(msg)
+                        if logger:
+                            logger.log(msg)
+                    elif serie:
+                        resultados[manga['id']] = {'serie': {'slug': serie['slug']}}
+                        
+                        msg = f"[OK] '{manga['title']}' slug obtenido tras reinicializacion"
+                        if mode_debug:
+                            print(msg)
+                        if logger:
+                            logger.log(msg)
                 
                 except Exception as e:
                     msg = f"[ERROR] Fallo obteniendo slug de '{manga['title']}': {e}"
@@ -633,56 +959,56 @@ class OlympusComAPIClient:
         if logger:
             logger.log(msg)
         
-        pendientes = {m['id']: m['title'].lower() for m in manga_list}
+        emparejador = EmparejadorNombres({m['id']: m['title'] for m in manga_list})
+        pendientes = set(m['id'] for m in manga_list)
         
-        for page in range(1, last_page + 1):
+        def procesar_pagina(direction, page, series_block):
+            if series_block is None:
+                return False
+            
             msg = f'Buscando en la pagina {page} de {last_page}'
             if mode_debug:
                 print(msg)
             if logger:
                 logger.log(msg)
             
-            if not pendientes:
-                msg = f"[DEBUG] Todos encontrados en pagina {page-1}"
+            page_url = f"{self.BASE_URL}?type=comic&direction={direction}&page={page}"
+            
+            # Una consulta al diccionario por serie (como FASE 5); lo que no
+            # aparece exacto se busca por contencion ("Foo" en "Foo: El Regreso"),
+            # que es lo que hacia esta busqueda de ultimo recurso
+            encontrados = emparejador.emparejar_pagina(series_block["data"], pendientes, difuso=self.BUSQUEDA_DIFUSA)
+            restantes = pendientes.difference(encontrados)
+            if restantes:
+                encontrados.update(emparejador.contenidos(series_block["data"], restantes))
+            for manga_id, serie in encontrados.items():
+                resultados[manga_id] = {
+                    'serie': serie,
+                    'page_url': page_url
+                }
+                pendientes.remove(manga_id)
+                
+                msg = f"[DEBUG]{serie['name']} Encontrado en pagina {page}"
                 if mode_debug:
                     print(msg)
                 if logger:
                     logger.log(msg)
-                break
-            
-            page_url = f"{self.BASE_URL}?type=comic&direction=desc&page={page}"
-            data = self._get_page_cached(page_url)
-            
-            if not data:
-                continue
             
-            series_block = self._extraer_series(data)
-            if not series_block:
-                continue
-            
-            encontrados_ids = []
-            
-            for serie in series_block["data"]:
-                nombre_serie = serie["name"].lower()
-                for manga_id, nombre_buscar in pendientes.items():
-                    if nombre_buscar in nombre_serie:
-                        resultados[manga_id] = {
-                            'serie': serie,
-                            'page_url': page_url
-                        }
-                        encontrados_ids.append(manga_id)
-                        
-                        msg = f"[DEBUG]{nombre_buscar} Encontrado en pagina {page}"
-                        if mode_debug:
-                            print(msg)
-                        if logger:
-                            logger.log(msg)
-            
-            for mid in encontrados_ids:
-                del pendientes[mid]
-            
-            if page < last_page:
-                time.sleep(3)
+            if not pendientes:
+                msg = f"[DEBUG] Todos encontrados en pagina {page}"
+                if mode_debug:
+                    print(msg)
+                if logger:
+                    logger.log(msg)
+                return True
+            return False
+        
+        # La pagina 1 ya esta en cache; el resto en paralelo
+        if not procesar_pagina('desc', 1, series_block):
+            self._recorrer_paginas(
+                (('desc', page) for page in range(2, last_page + 1)),
+                procesar_pagina, mode_debug=mode_debug, logger=logger
+            )
     
     def _get_adjacent_urls(self, url):
         """Obtener URLs prev y next"""
@@ -706,7 +1032,7 @@ class OlympusComAPIClient:
         """Obtener pagina con cache"""
         if url not in self._page_cache:
             try:
-                response = self.session.get(url, timeout=10)
+                response = self.get(url, timeout=10)
                 self._page_cache[url] = response.json()
             except Exception as e:
                 print(f"[ERROR] Error obteniendo {url}: {e}")
@@ -720,7 +1046,7 @@ class OlympusComAPIClient:
         
         try:
             # Usar GET en vez de HEAD (algunos servidores no soportan HEAD bien)
-            response = self.session.get(check_url, timeout=15, allow_redirects=True)
+            response = self.get(check_url, timeout=15, allow_redirects=True)
             
             # Si status 200 y no es error page
             if response.status_code == 200:
@@ -741,7 +1067,7 @@ class OlympusComAPIClient:
     def _validar_check_url(self, check_url, logger=None):
         """Validar si check_url actual es valido con HEAD request"""
         try:
-            response = self.session.head(check_url, timeout=15, allow_redirects=True)
+            response = http_pool.head(check_url, 'olympus_com', timeout=15, allow_redirects=True)
             
             # Si es 200 y no es HTML Cloudflare
             if response.status_code == 200:
@@ -759,21 +1085,7 @@ class OlympusComAPIClient:
     @staticmethod
     def _normalizar_nombre(nombre):
         """Normalizar nombre para comparacion (lowercase, sin espacios extras, sin puntuacion)"""
-        import re
-        
-        # Lowercase
-        nombre = nombre.lower()
-        
-        # Remover espacios extras (multiples espacios, inicio, fin)
-        nombre = ' '.join(nombre.split())
-        
-        # Remover puntuacion y caracteres especiales (mantener espacios y letras)
-        nombre = re.sub(r'[^\w\s]', '', nombre)
-        
-        # Remover espacios restantes
-        nombre = nombre.replace(' ', '')
-        
-        return nombre
+        return normalizar_nombre(nombre)
                 
     def _inicializar_cache_manga(self, manga_list, mode_debug=False, logger=None):
         """Inicializar cache para mangas sin entrada en olympus_com_cache"""
@@ -793,11 +1105,8 @@ class OlympusComAPIClient:
         
         # Obtener total paginas
         try:
-            url = "https://olympusbiblioteca.com/api/series"
-            params = {'type': 'comic', 'direction': 'asc', 'page': 1}
-            response = self.session.get(url, params=params, timeout=30)
-            data = response.json()
-            total_pages = data['data']['series']['last_page']
+            primera = self._descargar_series('asc', 1)
+            total_pages = primera['last_page']
             
             msg = f"[INIT] Total paginas API: {total_pages}"
             if mode_debug:
@@ -821,111 +1130,74 @@ class OlympusComAPIClient:
                 'desc_slug': None
             }
         
-        # FASE 1: Buscar en ASC
-        msg = f"[INIT] Buscando en orden ASC..."
+        # Titulos normalizados una sola vez; mejor candidato aproximado por direction
+        titulos = {m['id']: m['title'] for m in manga_list}
+        emparejador = EmparejadorNombres(titulos)
+        difusos = {mid: {'asc': (0.0, None, None), 'desc': (0.0, None, None)} for mid in titulos}
+        
+        # FASE 1-2: Buscar en ASC y DESC a la vez (una sola cola de paginas:
+        # asc 1, desc 1, asc 2, desc 2...). Cada direction deja de pedir
+        # paginas cuando ya no le queda nada pendiente
+        msg = f"[INIT] Buscando en orden ASC y DESC..."
         if mode_debug:
             print(msg)
         if logger:
             logger.log(msg)
         
-        pendientes_asc = set(m['id'] for m in manga_list)
+        pendientes = {
+            'asc': set(m['id'] for m in manga_list),
+            'desc': set(m['id'] for m in manga_list)
+        }
         
-        for page in range(1, total_pages + 1):
-            if not pendientes_asc:
-                break
+        def procesar_pagina(direction, page, series_block):
+            pendientes_dir = pendientes[direction]
+            if series_block is None or not pendientes_dir:
+                return not pendientes['asc'] and not pendientes['desc']
             
             if page % 10 == 0:
-                msg = f"[INIT] Progreso ASC: {page}/{total_pages}"
+                msg = f"[INIT] Progreso {direction.upper()}: {page}/{total_pages}"
                 if mode_debug:
                     print(msg)
                 if logger:
                     logger.log(msg)
             
-            try:
-                params = {'type': 'comic', 'direction': 'asc', 'page': page}
-                response = self.session.get(url, params=params, timeout=30)
-                data = response.json()
-                series_list = data['data']['series']['data']
-                
-                # Buscar todos los mangas pendientes en esta pagina
-                for manga in manga_list:
-                    if manga['id'] not in pendientes_asc:
-                        continue
-                    
-                    nombre_buscar = OlympusComAPIClient._normalizar_nombre(manga['title'])
-                    
-                    for serie in series_list:
-                        nombre_serie = OlympusComAPIClient._normalizar_nombre(serie['name'])
-                        if nombre_serie == nombre_buscar:
-                            resultados[manga['id']]['asc_page'] = page
-                            resultados[manga['id']]['asc_slug'] = serie['slug']
-                            pendientes_asc.remove(manga['id'])
-                            
-                            msg = f"[INIT] '{manga['title']}' encontrado en ASC pagina {page}"
-                            if mode_debug:
-                                print(msg)
-                            if logger:
-                                logger.log(msg)
-                            break
-            
-            except Exception as e:
-                msg = f"[ERROR] Fallo en ASC pagina {page}: {e}"
-                if logger:
-                    logger.log(msg)
-                continue
-        
-        # FASE 2: Buscar en DESC
-        msg = f"[INIT] Buscando en orden DESC..."
-        if mode_debug:
-            print(msg)
-        if logger:
-            logger.log(msg)
-        
-        pendientes_desc = set(m['id'] for m in manga_list)
-        
-        for page in range(1, total_pages + 1):
-            if not pendientes_desc:
-                break
+            series_list = series_block['data']
             
-            if page % 10 == 0:
-                msg = f"[INIT] Progreso DESC: {page}/{total_pages}"
+            # Buscar todos los mangas pendientes en esta pagina (una consulta al diccionario por serie)
+            for mid, serie in emparejador.emparejar_pagina(series_list, pendientes_dir).items():
+                resultados[mid][f'{direction}_page'] = page
+                resultados[mid][f'{direction}_slug'] = serie['slug']
+                pendientes_dir.remove(mid)
+                
+                msg = f"[INIT] '{titulos[mid]}' encontrado en {direction.upper()} pagina {page}"
                 if mode_debug:
                     print(msg)
                 if logger:
                     logger.log(msg)
             
-            try:
-                params = {'type': 'comic', 'direction': 'desc', 'page': page}
-                response = self.session.get(url, params=params, timeout=30)
-                data = response.json()
-                series_list = data['data']['series']['data']
-                
-                # Buscar todos los mangas pendientes en esta pagina
-                for manga in manga_list:
-                    if manga['id'] not in pendientes_desc:
-                        continue
-                    
-                    nombre_buscar = OlympusComAPIClient._normalizar_nombre(manga['title'])
-                    
-                    for serie in series_list:
-                        nombre_serie = OlympusComAPIClient._normalizar_nombre(serie['name'])
-                        if nombre_serie == nombre_buscar:
-                            resultados[manga['id']]['desc_page'] = page
-                            resultados[manga['id']]['desc_slug'] = serie['slug']
-                            pendientes_desc.remove(manga['id'])
-                            
-                            msg = f"[INIT] '{manga['title']}' encontrado en DESC pagina {page}"
-                            if mode_debug:
-                                print(msg)
-                            if logger:
-                                logger.log(msg)
-                            break
+            # Guardar el nombre mas parecido por si el exacto no aparece
+            if self.BUSQUEDA_DIFUSA and pendientes_dir:
+                for mid, (similitud, serie) in emparejador.mejores_parecidos(series_list, pendientes_dir).items():
+                    if similitud > difusos[mid][direction][0]:
+                        difusos[mid][direction] = (similitud, page, serie)
             
-            except Exception as e:
-                msg = f"[ERROR] Fallo en DESC pagina {page}: {e}"
-                if logger:
-                    logger.log(msg)
-                continue
+            return not pendientes['asc'] and not pendientes['desc']
+        
+        # La pagina 1 ASC ya esta descargada
+        if not procesar_pagina('asc', 1, primera):
+            trabajos = (
+                (direction, page)
+                for page in range(1, total_pages + 1)
+                for direction in ('asc', 'desc')
+                if (direction, page) != ('asc', 1) and pendientes[direction]
+            )
+            peticiones = self._recorrer_paginas(trabajos, procesar_pagina, mode_debug=mode_debug, logger=logger)
+            
+            msg = f"[INIT] Busqueda terminada en {peticiones + 1} peticion(es) de {total_pages * 2} posibles"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
         
         # FASE 3: Validar slugs y guardar en cache
         msg = f"\n{'='*60}"
@@ -950,6 +1222,18 @@ class OlympusComAPIClient:
             mid = manga['id']
             res = resultados[mid]
             
+            # Sin coincidencia exacta: usar la serie mas parecida (si supera el umbral)
+            for direction in ('asc', 'desc'):
+                similitud, page, serie = difusos[mid][direction]
+                if res[f'{direction}_page'] is None and serie:
+                    res[f'{direction}_page'] = page
+                    res[f'{direction}_slug'] = serie['slug']
+                    
+                    msg = f"[DIFUSO] '{manga['title']}' ~ '{serie['name']}' ({similitud:.2f}) en {direction.upper()} pagina {page}"
+                    print(msg)
+                    if logger:
+                        logger.log(msg)
+            
             # Verificar que se encontro en ambas paginas
             if res['asc_page'] is None or res['desc_page'] is None:
                 msg = f"\n{'*'*60}"
@@ -24,13 +24,19 @@ class OlympusComChecker(BaseChecker):
             }
         
         try:
-            nuevos_caps = api.obtener_nuevos_capitulos(
-                slug, 
-                manga_data['last_checked_chapter'],
+            marca_id, marca_num = OlympusComChecker._marca_guardada(manga_data)
+            nuevos_caps, marca = api.buscar_nuevos_capitulos(
+                slug,
+                marca_id,
+                marca_num,
                 logger=logger,
                 mode_debug=mode_debug
             )
             
+            # Fallo de la API -> resultado de error (no 'sin_nuevos')
+            if nuevos_caps is None:
+                raise RuntimeError("No se pudieron obtener capitulos de la API")
+            
             if nuevos_caps:
                 return {
                     'manga_id': manga_data['id'],
@@ -39,7 +45,8 @@ class OlympusComChecker(BaseChecker):
                     'new_chapters_count': len(nuevos_caps),
                     'last_checked_chapter': manga_data['last_checked_chapter'],
                     'current_chapter': nuevos_caps[0]['name'],
-                    'nuevos_capitulos': nuevos_caps
+                    'nuevos_capitulos': nuevos_caps,
+                    'marca_capitulo': marca
                 }
             else:
                 return {
@@ -49,7 +56,8 @@ class OlympusComChecker(BaseChecker):
                     'new_chapters_count': 0,
                     'last_checked_chapter': manga_data['last_checked_chapter'],
                     'current_chapter': manga_data['last_checked_chapter'],
-                    'nuevos_capitulos': []
+                    'nuevos_capitulos': [],
+                    'marca_capitulo': marca
                 }
                 
         except Exception as e:
@@ -68,7 +76,7 @@ class OlympusComChecker(BaseChecker):
             }
             
     @staticmethod
-    def check_batch(manga_list, mode_debug=True, logger=None):
+    def check_batch(manga_list, mode_debug=True, logger=None, callback=None):
         from database.db_manager import DatabaseManager
         
         api = OlympusComAPIClient()
@@ -88,7 +96,7 @@ class OlympusComChecker(BaseChecker):
                 if logger:
                     logger.log(msg)
                 
-                resultados.append({
+                BaseChecker._agregar_resultado(resultados, callback, {
                     'manga_id': mid,
                     'title': manga['title'],
                     'has_new': False,
@@ -106,17 +114,23 @@ class OlympusComChecker(BaseChecker):
                 logger.log(msg)
             
             try:
-                nuevos_caps = api.obtener_nuevos_capitulos(slug, last_checked, logger=logger, mode_debug = mode_debug)
+                marca_id, marca_num = OlympusComChecker._marca_guardada(manga)
+                nuevos_caps, marca = api.buscar_nuevos_capitulos(slug, marca_id, marca_num, logger=logger, mode_debug = mode_debug)
+                
+                # Fallo de la API -> resultado de error (no 'sin_nuevos')
+                if nuevos_caps is None:
+                    raise RuntimeError("No se pudieron obtener capitulos de la API")
                 
                 if nuevos_caps:
-                    resultados.append({
+                    BaseChecker._agregar_resultado(resultados, callback, {
                         'manga_id': mid,
                         'title': manga['title'],
                         'has_new': True,
                         'new_chapters_count': len(nuevos_caps),
                         'last_checked_chapter': last_checked,
                         'current_chapter': nuevos_caps[0]['name'],
-                        'nuevos_capitulos': nuevos_caps
+                        'nuevos_capitulos': nuevos_caps,
+                        'marca_capitulo': marca
                     })
                     
                     msg = f"  [OK] Nuevos: {len(nuevos_caps)}, Ultimo: {nuevos_caps[0]['name']}"
@@ -125,14 +139,15 @@ class OlympusComChecker(BaseChecker):
                     if logger:
                         logger.log(msg)
                 else:
-                    resultados.append({
+                    BaseChecker._agregar_resultado(resultados, callback, {
                         'manga_id': mid,
                         'title': manga['title'],
                         'has_new': False,
                         'new_chapters_count': 0,
                         'last_checked_chapter': last_checked,
                         'current_chapter': last_checked,
-                        'nuevos_capitulos': []
+                        'nuevos_capitulos': [],
+                        'marca_capitulo': marca
                     })
                     
                     msg = f"  [OK] Sin capitulos nuevos. Cap actual: {last_checked}, Ultimo descargado: {last_checked}"
@@ -147,7 +162,7 @@ class OlympusComChecker(BaseChecker):
                 if logger:
                     logger.log(msg)
                 
-                resultados.append({
+                BaseChecker._agregar_resultado(resultados, callback, {
                     'manga_id': mid,
                     'title': manga['title'],
                     'has_new': False,
@@ -157,8 +172,7 @@ class OlympusComChecker(BaseChecker):
                     'nuevos_capitulos': []
                 })
             
-            import time
-            time.sleep(60)
+            # El ritmo entre titulos lo marca el rate limiter del cliente API
         
         return resultados
     
@@ -283,7 +297,7 @@ class OlympusComChecker(BaseChecker):
                             
                             url = "https://olympusbiblioteca.com/api/series"
                             params = {'type': 'comic', 'direction': direction, 'page': page}
-                            response = api.session.get(url, params=params, timeout=30)
+                            response = api.get(url, params=params, timeout=30)
                             data = response.json()
                             series_list = data['data']['series']['data']
                             
@@ -342,11 +356,35 @@ class OlympusComChecker(BaseChecker):
         if logger:
             logger.log(msg)
     
+    @staticmethod
+    def _marca_guardada(manga_data):
+        """
+        (id, numero) del ultimo capitulo que tenemos. El numero sale siempre de
+        last_checked_chapter; el id guardado solo vale si es de ese mismo numero
+        (si last_checked_chapter cambio al descargar, el id se vuelve a aprender)
+        """
+        marca_num = OlympusComAPIClient.numero_capitulo(manga_data.get('last_checked_chapter'))
+        marca_id = manga_data.get('olympus_last_chapter_id')
+        if marca_id is None or manga_data.get('olympus_last_chapter_num') != marca_num:
+            marca_id = None
+        return marca_id, marca_num
+    
     @staticmethod
     def _descargar_cover(serie, manga_data, mode_debug=False, logger=None):
         """Descargar cover del manga si no existe"""
-        import requests
         import os
+        from utils import http_pool
+        from database.db_manager import DatabaseManager
+        from utils.portadas import portada_registrada
+        
+        db = DatabaseManager()
+        if portada_registrada(manga_data, db):
+            msg = f"[INFO] Cover ya existe para '{manga_data['title']}'"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+            return
         
         cover_url = serie.get('cover')
         if not cover_url:
@@ -363,15 +401,6 @@ class OlympusComChecker(BaseChecker):
         
         cover_path = os.path.join(manga_dir, 'portada.webp')
         
-        # Si ya existe, skip
-        if os.path.exists(cover_path):
-            msg = f"[INFO] Cover ya existe para '{manga_data['title']}'"
-            if mode_debug:
-                print(msg)
-            if logger:
-                logger.log(msg)
-            return
-        
         # Descargar
         try:
             msg = f"[INFO] Descargando cover para '{manga_data['title']}'..."
@@ -380,12 +409,15 @@ class OlympusComChecker(BaseChecker):
             if logger:
                 logger.log(msg)
             
-            response = requests.get(cover_url, timeout=15)
+            response = http_pool.get(cover_url, 'covers', timeout=15)
             response.raise_for_status()
             
             with open(cover_path, 'wb') as f:
                 f.write(response.content)
             
+            db.update_cover_path(manga_data['id'], 'portada.webp')
+            manga_data['cover_path'] = 'portada.webp'
+            
             msg = f"[OK] Cover descargado: {cover_path}"
             if mode_debug:
                 print(msg)
@@ -1,5 +1,6 @@
 from checkers.base_checker import BaseChecker
-import requests
+from utils import http_pool
+from utils.rate_limiter import get_limiter
 
 class OlympusNetChecker(BaseChecker):
     
@@ -26,7 +27,10 @@ class OlympusNetChecker(BaseChecker):
         try:
             api_url = f"https://olympusbiblioteca.net/wp-admin/admin-ajax.php?action=load_chapters&page=1&per_page=999&post_id={post_id}&reverse=0"
             
-            response = requests.get(api_url, timeout=15)
+            limiter = get_limiter('olympus_net', api_url)
+            limiter.esperar()
+            response = http_pool.get(api_url, 'olympus_net', timeout=15)
+            limiter.registrar_respuesta(response, espera_json=True, mode_debug=mode_debug, logger=logger)
             response.raise_for_status()
             data = response.json()
             
@@ -109,7 +113,7 @@ class OlympusNetChecker(BaseChecker):
             }
 
     @staticmethod
-    def check_batch(manga_list, mode_debug=True, logger=None):
+    def check_batch(manga_list, mode_debug=True, logger=None, callback=None):
         """Batch processing para olympus_net"""
         from database.db_manager import DatabaseManager
         import re
@@ -127,7 +131,7 @@ class OlympusNetChecker(BaseChecker):
                 print(msg)
                 if logger:
                     logger.log(msg)
-                resultados.append({
+                BaseChecker._agregar_resultado(resultados, callback, {
                     'manga_id': mid,
                     'title': manga['title'],
                     'has_new': False,
@@ -147,12 +151,15 @@ class OlympusNetChecker(BaseChecker):
             try:
                 api_url = f"https://olympusbiblioteca.net/wp-admin/admin-ajax.php?action=load_chapters&page=1&per_page=999&post_id={post_id}&reverse=0"
                 
-                response = requests.get(api_url, timeout=15)
+                limiter = get_limiter('olympus_net', api_url)
+                limiter.esperar()
+                response = http_pool.get(api_url, 'olympus_net', timeout=15)
+                limiter.registrar_respuesta(response, espera_json=True, mode_debug=mode_debug, logger=logger)
                 response.raise_for_status()
                 data = response.json()
                 
                 if not data or not isinstance(data, list) or len(data) == 0:
-                    resultados.append({
+                    BaseChecker._agregar_resultado(resultados, callback, {
                         'manga_id': mid,
                         'title': manga['title'],
                         'has_new': False,
@@ -174,7 +181,7 @@ class OlympusNetChecker(BaseChecker):
                 match = re.search(r'(\d+(?:\.\d+)?)', chapter_name)
                 
                 if not match:
-                    resultados.append({
+                    BaseChecker._agregar_resultado(resultados, callback, {
                         'manga_id': mid,
                         'title': manga['title'],
                         'has_new': False,
@@ -235,7 +242,7 @@ class OlympusNetChecker(BaseChecker):
                                 'url': cap.get('url')
                             })
                 
-                resultados.append({
+                BaseChecker._agregar_resultado(resultados, callback, {
                     'manga_id': mid,
                     'title': manga['title'],
                     'has_new': has_new,
@@ -256,7 +263,7 @@ class OlympusNetChecker(BaseChecker):
                 print(msg)
                 if logger:
                     logger.log(msg)
-                resultados.append({
+                BaseChecker._agregar_resultado(resultados, callback, {
                     'manga_id': mid,
                     'title': manga['title'],
                     'has_new': False,
@@ -265,9 +272,5 @@ class OlympusNetChecker(BaseChecker):
                     'current_chapter': None,
                     'nuevos_capitulos': []
                 })
-    
-            import time
-            time.sleep(5)        
-
         
         return resultados
\ No newline at end of file
@@ -1,8 +1,8 @@
 from checkers.base_checker import BaseChecker
-import requests
+from utils import http_pool
 from bs4 import BeautifulSoup
 import re
-import time
+from utils.rate_limiter import get_limiter
 
 class TmoChecker(BaseChecker):
     
@@ -32,19 +32,10 @@ class TmoChecker(BaseChecker):
             }
         
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                              "AppleWebKit/537.36 (KHTML, like Gecko) "
-                              "Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,"
-                          "image/avif,image/webp,image/apng,*/*;q=0.8",
-                "Accept-Language": "es-ES,es;q=0.9",
-                "Referer": "https://zonatmo.com/",
-                "Upgrade-Insecure-Requests": "1",
-                "DNT": "1"
-            }
-            
-            response = requests.get(check_url, headers=headers, timeout=15)
+            limiter = get_limiter('tmo', check_url)
+            limiter.esperar()
+            response = http_pool.get(check_url, 'tmo', timeout=15)
+            limiter.registrar_respuesta(response, mode_debug=mode_debug, logger=logger)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -148,7 +139,7 @@ class TmoChecker(BaseChecker):
             }
 
     @staticmethod
-    def check_batch(manga_list, mode_debug=True, logger=None):
+    def check_batch(manga_list, mode_debug=True, logger=None, callback=None):
         resultados = []
         
         for manga in manga_list:
@@ -159,22 +150,31 @@ class TmoChecker(BaseChecker):
                 logger.log(msg)
             
             result = TmoChecker.check_single(manga, mode_debug, logger)
-            resultados.append(result)
+            BaseChecker._agregar_resultado(resultados, callback, result)
             
             msg = f"  [OK] Cap actual: {result['current_chapter']}, Ultimo descargado: {result['last_checked_chapter']}, Nuevos: {result['new_chapters_count']}"
             if mode_debug:
                 print(msg)
             if logger:
                 logger.log(msg)
-            
-            time.sleep(30)
         
         return resultados
     
     @staticmethod
     def _descargar_cover(soup, manga_data, mode_debug=True, logger=None):
         """Descargar cover del manga si no existe"""
-        import os        
+        import os
+        from database.db_manager import DatabaseManager
+        from utils.portadas import portada_registrada
+        
+        db = DatabaseManager()
+        if portada_registrada(manga_data, db):
+            msg = f"[INFO] Cover ya existe para '{manga_data['title']}'"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+            return
         
         img = soup.find('img', {'class': 'book-thumbnail'})
         if not img or not img.get('src'):
@@ -196,16 +196,6 @@ class TmoChecker(BaseChecker):
         
         cover_path = os.path.join(manga_dir, f'portada.{ext}')
         
-        for existing_ext in ['webp', 'jpg', 'jpeg', 'png']:
-            existing_path = os.path.join(manga_dir, f'portada.{existing_ext}')
-            if os.path.exists(existing_path):
-                msg = f"[INFO] Cover ya existe para '{manga_data['title']}'"
-                if mode_debug:
-                    print(msg)
-                if logger:
-                    logger.log(msg)
-                return
-        
         try:
             msg = f"[INFO] Descargando cover para '{manga_data['title']}'..."
             if mode_debug:
@@ -213,19 +203,16 @@ class TmoChecker(BaseChecker):
             if logger:
                 logger.log(msg)
             
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Referer": manga_data.get('check_url', 'https://zonatmo.com/'),
-                "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
-                "Accept-Language": "es-ES,es;q=0.9"
-            }
-            
-            response = requests.get(cover_url, headers=headers, timeout=15)
+            headers = {"Referer": manga_data.get('check_url', 'https://zonatmo.com/')}
+            response = http_pool.get(cover_url, 'tmo_covers', headers=headers, timeout=15)
             response.raise_for_status()
             
             with open(cover_path, 'wb') as f:
                 f.write(response.content)
             
+            db.update_cover_path(manga_data['id'], f'portada.{ext}')
+            manga_data['cover_path'] = f'portada.{ext}'
+            
             msg = f"[OK] Cover descargado: {cover_path}"
             if mode_debug:
                 print(msg)
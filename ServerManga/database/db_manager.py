@@ -1,11 +1,20 @@
 import sqlite3
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
+
+# Conexiones persistentes: una por hilo y por fichero de DB
+# (sqlite3 no permite compartir una conexion entre hilos)
+_local = threading.local()
 
 class DatabaseManager:
+    BUSY_TIMEOUT_MS = 30000
+    CACHED_STATEMENTS = 256
+    
     def __init__(self):
         base_dir = '/home/pablopi/Server/ServerManga'
-        db_path = os.path.join(base_dir, 'database', 'manga_tracker.db')
+        # MANGA_DB_PATH -> otra DB (benchmarks/pruebas sin tocar la real)
+        db_path = os.environ.get('MANGA_DB_PATH') or os.path.join(base_dir, 'database', 'manga_tracker.db')
         sql_path = os.path.join(base_dir, 'database', 'init_db.sql')
         
         self.db_path = db_path
@@ -34,8 +43,27 @@ class DatabaseManager:
         return {key: value for key, value in zip(fields, row)}
     
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = self._dict_factory
+        """
+        Conexion persistente del hilo actual. Se usa con 'with' (commit/rollback),
+        nunca se cierra: WAL deja que el servidor lea mientras los workers escriben
+        """
+        conexiones = getattr(_local, 'conexiones', None)
+        if conexiones is None:
+            conexiones = _local.conexiones = {}
+        
+        conn = conexiones.get(self.db_path)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.BUSY_TIMEOUT_MS / 1000,
+                cached_statements=self.CACHED_STATEMENTS
+            )
+            conn.row_factory = self._dict_factory
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}')
+            conexiones[self.db_path] = conn
+        
         return conn
     
     # ========== PAGE TYPES ==========
@@ -103,14 +131,12 @@ class DatabaseManager:
                 (current_chapter, datetime.now(), manga_id)
             )
         conn.commit()
-        conn.close()
     
     def get_manga(self, manga_id):
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM manga WHERE id = ?', (manga_id,))
         result = cursor.fetchone()
-        conn.close()
         return result
     
     def get_manga_by_id(self, manga_id):
@@ -123,7 +149,6 @@ class DatabaseManager:
             WHERE m.id = ?
         ''', (manga_id,))
         results = cursor.fetchall()
-        conn.close()
         return results
     
     def get_all_manga(self):
@@ -135,7 +160,6 @@ class DatabaseManager:
             JOIN page_types pt ON m.page_type_id = pt.id
         ''')
         results = cursor.fetchall()
-        conn.close()
         return results
     
     def get_manga_by_page_type(self, page_type_id):
@@ -148,7 +172,6 @@ class DatabaseManager:
             WHERE m.page_type_id = ?
         ''', (page_type_id,))
         results = cursor.fetchall()
-        conn.close()
         return results
     
     def delete_manga(self, manga_id):
@@ -156,7 +179,6 @@ class DatabaseManager:
         cursor = conn.cursor()
         cursor.execute('DELETE FROM manga WHERE id = ?', (manga_id,))
         conn.commit()
-        conn.close()
         
     # TRACKING
     def get_manga_by_tracking(self, tracking_status):
@@ -169,7 +191,6 @@ class DatabaseManager:
             WHERE m.tracking = ?
         ''', (tracking_status,))
         results = cursor.fetchall()
-        conn.close()
         return results
         
     def get_manga_by_tracking_and_page(self, tracking_status, page_type_id):
@@ -189,7 +210,6 @@ class DatabaseManager:
         conn = self.get_connection()
         conn.execute("UPDATE manga SET tracking = ? WHERE id = ?", (tracking_status, manga_id))
         conn.commit()
-        conn.close()
 
     def update_manga_for_tracking(self, manga_id, last_checked, current_reading):
         """Actualiza manga al activar tracking"""
@@ -200,9 +220,100 @@ class DatabaseManager:
             (current_reading, current_reading, current_reading, manga_id)
         )
         conn.commit()
-        conn.close()
         
         
+    def apply_check_results(self, results):
+        """
+        Guardar resultados de un chequeo en una sola transaccion:
+        current_chapter (si hay nuevos), last_check_timestamp y last_check_status
+        """
+        if not results:
+            return 0
+        
+        ahora = datetime.now()
+        filas = []
+        for result in results:
+            if result.get('has_new'):
+                status = 'nuevos'
+            elif result.get('current_chapter') is None:
+                status = 'error'
+            else:
+                status = 'sin_nuevos'
+            
+            current_chapter = result['current_chapter'] if result.get('has_new') else None
+            filas.append((current_chapter, ahora, status, result['manga_id']))
+        
+        sql = '''UPDATE manga SET current_chapter = COALESCE(?, current_chapter),
+                 last_check_timestamp = ?, last_check_status = ? WHERE id = ?'''
+        # chapter: capitulo encontrado, para aprender el ritmo solo de los avances
+        # (has_new sigue a 1 en cada chequeo hasta que se descarga el capitulo)
+        sql_historial = '''INSERT INTO check_history (manga_id, checked_at, has_new, status, chapter)
+                           VALUES (?, ?, ?, ?, ?)'''
+        historial = [(mid, fecha, 1 if status == 'nuevos' else 0, status, chapter)
+                     for chapter, fecha, status, mid in filas]
+        
+        # Marca del ultimo capitulo (solo checkers que la calculan, p.ej. olympus_com)
+        sql_marca = '''UPDATE manga SET olympus_last_chapter_id = ?, olympus_last_chapter_num = ?
+                       WHERE id = ?'''
+        marcas = [(r['marca_capitulo']['id'], r['marca_capitulo']['num'], r['manga_id'])
+                  for r in results if r.get('marca_capitulo')]
+        
+        def _escribir():
+            with self.get_connection() as conn:
+                conn.executemany(sql, filas)
+                conn.executemany(sql_historial, historial)
+                if marcas:
+                    conn.executemany(sql_marca, marcas)
+        
+        try:
+            _escribir()
+        except sqlite3.OperationalError as e:
+            # DB anterior a last_check_status / check_history / olympus_last_chapter_*
+            if ('last_check_status' not in str(e) and 'check_history' not in str(e)
+                    and 'olympus_last_chapter' not in str(e)):
+                raise
+            self.add_last_check_status_column()
+            self.add_check_history_table()
+            self.add_olympus_last_chapter_columns()
+            _escribir()
+        
+        return len(filas)
+
+    def get_new_chapter_history(self, dias=180):
+        """
+        Fechas en las que avanzo el capitulo de cada manga: {manga_id: [checked_at, ...]}.
+        Los chequeos que repiten 'nuevos' con el mismo capitulo (sin descargar) no cuentan
+        """
+        from utils.check_scheduler import fechas_de_avance
+        
+        desde = datetime.now() - timedelta(days=dias)
+        filas = {}
+        
+        try:
+            with self.get_connection() as conn:
+                try:
+                    cursor = conn.execute('''
+                        SELECT manga_id, checked_at, chapter FROM check_history
+                        WHERE has_new = 1 AND checked_at >= ?
+                        ORDER BY checked_at
+                    ''', (desde,))
+                except sqlite3.OperationalError as e:
+                    # check_history anterior a la columna chapter
+                    if 'chapter' not in str(e):
+                        raise
+                    cursor = conn.execute('''
+                        SELECT manga_id, checked_at, NULL AS chapter FROM check_history
+                        WHERE has_new = 1 AND checked_at >= ?
+                        ORDER BY checked_at
+                    ''', (desde,))
+                for row in cursor.fetchall():
+                    filas.setdefault(row['manga_id'], []).append((row['checked_at'], row['chapter']))
+        except sqlite3.OperationalError:
+            # Sin tabla check_history todavia -> sin historial
+            pass
+        
+        return {mid: fechas_de_avance(f) for mid, f in filas.items()}
+    
     def update_olympus_index_url(self, manga_id, olympus_index_url):
         with self.get_connection() as conn:
             conn.execute('UPDATE manga SET olympus_index_url = ? WHERE id = ?',
@@ -214,6 +325,22 @@ class DatabaseManager:
             conn.execute('UPDATE manga SET last_download_url = ? WHERE id = ?',
                     (last_download_url, manga_id))
             conn.commit()
+    
+    def update_cover_path(self, manga_id, cover_path):
+        """Registrar fichero de portada (relativo a local_storage_path)"""
+        def _escribir():
+            with self.get_connection() as conn:
+                conn.execute('UPDATE manga SET cover_path = ? WHERE id = ?',
+                        (cover_path, manga_id))
+        
+        try:
+            _escribir()
+        except sqlite3.OperationalError as e:
+            # DB anterior a cover_path
+            if 'cover_path' not in str(e):
+                raise
+            self.add_cover_path_column()
+            _escribir()
             
     # METODOS OLYMPUS_COM CACHE
     
@@ -277,6 +404,78 @@ class DatabaseManager:
         """Eliminar cache olympus_com (forzar reinicializacion)"""
         with self.get_connection() as conn:
             conn.execute('DELETE FROM olympus_com_cache WHERE manga_id = ?', (manga_id,))
+    
+    # METODOS OLYMPUS CATALOGO (indice local de /api/series)
+    
+    def upsert_olympus_catalogo(self, series):
+        """
+        Guardar series del catalogo: [(nombre_normalizado, serie_id, nombre, slug, cover)]
+        Retorna cuantas eran nuevas o cambiaron de slug/cover
+        """
+        if not series:
+            return 0
+        
+        ahora = datetime.now()
+        claves = [s[0] for s in series]
+        
+        with self.get_connection() as conn:
+            marcas = ','.join('?' * len(claves))
+            cursor = conn.execute(f'''
+                SELECT nombre_normalizado, slug, cover FROM olympus_catalogo
+                WHERE nombre_normalizado IN ({marcas})
+            ''', claves)
+            existentes = {row['nombre_normalizado']: (row['slug'], row['cover']) for row in cursor.fetchall()}
+            
+            cambios = sum(1 for s in series if existentes.get(s[0]) != (s[3], s[4]))
+            
+            conn.executemany('''
+                INSERT INTO olympus_catalogo (nombre_normalizado, serie_id, nombre, slug, cover, actualizado)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(nombre_normalizado) DO UPDATE SET
+                    serie_id = excluded.serie_id, nombre = excluded.nombre, slug = excluded.slug,
+                    cover = excluded.cover, actualizado = excluded.actualizado
+            ''', [s + (ahora,) for s in series])
+        
+        return cambios
+    
+    def get_olympus_catalogo(self, nombre_normalizado):
+        """Serie del catalogo local por nombre normalizado"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT nombre_normalizado, serie_id, nombre, slug, cover
+                FROM olympus_catalogo WHERE nombre_normalizado = ?
+            ''', (nombre_normalizado,))
+            return cursor.fetchone()
+    
+    def buscar_olympus_catalogo(self, texto):
+        """Primera serie del catalogo local cuyo nombre contiene texto (literal, sin comodines)"""
+        patron = texto.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT nombre_normalizado, serie_id, nombre, slug, cover
+                FROM olympus_catalogo WHERE lower(nombre) LIKE ? ESCAPE '\\' LIMIT 1
+            ''', (f'%{patron}%',))
+            return cursor.fetchone()
+    
+    def get_olympus_catalogo_estado(self):
+        """{'completo', 'ultima_pagina', 'actualizado'} de la carga del catalogo"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT completo, ultima_pagina, actualizado FROM olympus_catalogo_estado WHERE id = 1
+            ''')
+            row = cursor.fetchone()
+            return row if row else {'completo': 0, 'ultima_pagina': 0, 'actualizado': None}
+    
+    def update_olympus_catalogo_estado(self, completo, ultima_pagina):
+        """Guardar progreso de la carga completa del catalogo"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                INSERT INTO olympus_catalogo_estado (id, completo, ultima_pagina, actualizado)
+                VALUES (1, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    completo = excluded.completo, ultima_pagina = excluded.ultima_pagina,
+                    actualizado = excluded.actualizado
+            ''', (1 if completo else 0, ultima_pagina, datetime.now()))
         
     # Metodos auxiliares de una sola vez   
     
@@ -293,8 +492,6 @@ class DatabaseManager:
                 print("[INFO] Columna olympus_net_post_id ya existe")
             else:
                 print(f"[ERROR] {str(e)}")
-        finally:
-            conn.close()
          
     def add_current_reading_column(self):
         """Agrega columna current_reading si no existe"""
@@ -309,8 +506,6 @@ class DatabaseManager:
                 print("[INFO] Columna current_reading ya existe")
             else:
                 print(f"[ERROR] {str(e)}")
-        finally:
-            conn.close()
             
     def add_tracking_column(self):
         """Agrega columna tracking (bool) y setea existing manga a true"""
@@ -326,8 +521,6 @@ class DatabaseManager:
                 print("[INFO] Columna tracking ya existe")
             else:
                 print(f"[ERROR] {str(e)}")
-        finally:
-            conn.close()
             
     def add_downloader_column(self):
         with self.get_connection() as conn:
@@ -353,10 +546,90 @@ class DatabaseManager:
                 print("[INFO] Columna slug ya existe")
             else:
                 print(f"[ERROR] {str(e)}")
-        finally:
-            conn.close()
             
             
+    def add_last_check_status_column(self):
+        """Agrega columna last_check_status (resultado del ultimo chequeo)"""
+        with self.get_connection() as conn:
+            try:
+                conn.execute('ALTER TABLE manga ADD COLUMN last_check_status TEXT')
+                print("[OK] Columna last_check_status agregada")
+            except Exception as e:
+                if "duplicate column" in str(e).lower():
+                    print("[INFO] Columna last_check_status ya existe")
+                else:
+                    print(f"[ERROR] {e}")
+
+    def add_cover_path_column(self):
+        """Agrega columna cover_path (fichero de portada dentro de local_storage_path)"""
+        with self.get_connection() as conn:
+            try:
+                conn.execute('ALTER TABLE manga ADD COLUMN cover_path TEXT')
+                print("[OK] Columna cover_path agregada")
+            except Exception as e:
+                if "duplicate column" in str(e).lower():
+                    print("[INFO] Columna cover_path ya existe")
+                else:
+                    print(f"[ERROR] {e}")
+                return
+        
+        # Columna nueva: registrar las portadas que ya estan en disco
+        self.registrar_portadas_en_disco()
+    
+    def registrar_portadas_en_disco(self):
+        """Rellenar cover_path con la portada.<ext> encontrada en disco. Retorna cuantas"""
+        from utils.portadas import buscar_portada
+        
+        filas = []
+        with self.get_connection() as conn:
+            for manga in conn.execute('SELECT id, local_storage_path FROM manga WHERE cover_path IS NULL').fetchall():
+                fichero = buscar_portada(manga['local_storage_path'])
+                if fichero:
+                    filas.append((fichero, manga['id']))
+            conn.executemany('UPDATE manga SET cover_path = ? WHERE id = ?', filas)
+        return len(filas)
+
+    def add_olympus_last_chapter_columns(self):
+        """Agrega columnas olympus_last_chapter_id/_num (marca del ultimo capitulo que tenemos)"""
+        with self.get_connection() as conn:
+            for columna, tipo in (('olympus_last_chapter_id', 'INTEGER'), ('olympus_last_chapter_num', 'REAL')):
+                try:
+                    conn.execute(f'ALTER TABLE manga ADD COLUMN {columna} {tipo}')
+                    print(f"[OK] Columna {columna} agregada")
+                except Exception as e:
+                    if "duplicate column" in str(e).lower():
+                        print(f"[INFO] Columna {columna} ya existe")
+                    else:
+                        print(f"[ERROR] {e}")
+
+    def add_check_history_table(self):
+        """Crear tabla check_history (un registro por manga y chequeo)"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS check_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    manga_id INTEGER NOT NULL,
+                    checked_at DATETIME NOT NULL,
+                    has_new INTEGER NOT NULL DEFAULT 0,
+                    status TEXT,
+                    chapter TEXT,
+                    FOREIGN KEY (manga_id) REFERENCES manga(id) ON DELETE CASCADE
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_check_history_manga 
+                ON check_history(manga_id, checked_at)
+            ''')
+            
+            # Tablas creadas antes de la columna chapter
+            try:
+                conn.execute('ALTER TABLE check_history ADD COLUMN chapter TEXT')
+                print("[OK] Columna check_history.chapter agregada")
+            except Exception as e:
+                if "duplicate column" not in str(e).lower():
+                    print(f"[ERROR] {e}")
+    
     def add_olympus_com_cache_table(self):
         """Crear tabla olympus_com_cache si no existe"""
         with self.get_connection() as conn:
@@ -373,4 +646,27 @@ class DatabaseManager:
             conn.execute('''
                 CREATE INDEX IF NOT EXISTS idx_olympus_cache_manga 
                 ON olympus_com_cache(manga_id)
-            ''')
\ No newline at end of file
+            ''')
+    
+    def add_olympus_catalogo_table(self):
+        """Crear tablas olympus_catalogo y olympus_catalogo_estado si no existen"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS olympus_catalogo (
+                    nombre_normalizado TEXT PRIMARY KEY,
+                    serie_id INTEGER,
+                    nombre TEXT NOT NULL,
+                    slug TEXT,
+                    cover TEXT,
+                    actualizado DATETIME
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS olympus_catalogo_estado (
+                    id INTEGER PRIMARY KEY CHECK(id = 1),
+                    completo INTEGER NOT NULL DEFAULT 0,
+                    ultima_pagina INTEGER NOT NULL DEFAULT 0,
+                    actualizado DATETIME
+                )
+            ''')
@@ -19,10 +19,14 @@ CREATE TABLE IF NOT EXISTS manga (
     page_type_id INTEGER NOT NULL,
     local_storage_path TEXT NOT NULL,
     last_check_timestamp DATETIME,
+    last_check_status TEXT,
     olympus_index_url TEXT,
     last_download_url TEXT,
     slug TEXT,
     olympus_net_post_id INTEGER,
+    cover_path TEXT,
+    olympus_last_chapter_id INTEGER,
+    olympus_last_chapter_num REAL,
     FOREIGN KEY (page_type_id) REFERENCES page_types(id)
 );
 
@@ -39,4 +43,34 @@ CREATE TABLE IF NOT EXISTS olympus_com_cache (
     FOREIGN KEY (manga_id) REFERENCES manga(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_olympus_cache_manga ON olympus_com_cache(manga_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_olympus_cache_manga ON olympus_com_cache(manga_id);
+
+
+CREATE TABLE IF NOT EXISTS olympus_catalogo (
+    nombre_normalizado TEXT PRIMARY KEY,
+    serie_id INTEGER,
+    nombre TEXT NOT NULL,
+    slug TEXT,
+    cover TEXT,
+    actualizado DATETIME
+);
+
+CREATE TABLE IF NOT EXISTS olympus_catalogo_estado (
+    id INTEGER PRIMARY KEY CHECK(id = 1),
+    completo INTEGER NOT NULL DEFAULT 0,
+    ultima_pagina INTEGER NOT NULL DEFAULT 0,
+    actualizado DATETIME
+);
+
+
+CREATE TABLE IF NOT EXISTS check_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    manga_id INTEGER NOT NULL,
+    checked_at DATETIME NOT NULL,
+    has_new INTEGER NOT NULL DEFAULT 0,
+    status TEXT,
+    chapter TEXT,
+    FOREIGN KEY (manga_id) REFERENCES manga(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_check_history_manga ON check_history(manga_id, checked_at);
\ No newline at end of file
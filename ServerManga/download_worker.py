@@ -8,6 +8,7 @@ sys.path.insert(0, BASE_DIR)
 from database.db_manager import DatabaseManager
 from playwright.sync_api import sync_playwright
 from utils.logger import Logger, create_log_path
+from utils import http_pool
 
 # Mapeo de page_types a clases downloader
 DOWNLOADER_CLASSES = {
@@ -374,6 +375,7 @@ def main():
         traceback.print_exc()
         sys.exit(1)
     finally:
+        http_pool.cerrar_sesiones()
         input("\nPresiona Enter para cerrar...")
 
 if __name__ == "__main__":
@@ -1,7 +1,31 @@
 from abc import ABC, abstractmethod
 import os
-import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from utils import http_pool
+from utils.html_gzip import guardar_html
+from utils.manifiesto_capitulos import registrar_capitulo
+from utils.plantillas import cargar_plantilla
+from utils.rate_limiter import get_limiter
+
+# Conexiones simultaneas maximas contra un mismo host de imagenes
+MAX_DESCARGAS_POR_HOST = 4
+
+# Tamano de bloque al volcar imagenes a disco (nunca se tiene la imagen entera en RAM)
+CHUNK_DESCARGA = 64 * 1024
+
+_semaforos_host = {}
+_semaforos_lock = threading.Lock()
+
+def semaforo_host(url):
+    """Semaforo compartido por host (limita conexiones aunque haya varios capitulos a la vez)"""
+    host = urlparse(url).netloc
+    with _semaforos_lock:
+        if host not in _semaforos_host:
+            _semaforos_host[host] = threading.BoundedSemaphore(MAX_DESCARGAS_POR_HOST)
+        return _semaforos_host[host]
 
 class BaseDownloader(ABC):
     
@@ -40,83 +64,127 @@ class BaseDownloader(ABC):
         pass
     
     @staticmethod
-    def download_images(image_urls, chapter_num, content_dir, mode_debug=False, logger=None):
-        """Descargar imagenes a raw_Capitulo_X/. Retorna list[str] filenames"""
+    def download_images(image_urls, chapter_num, content_dir, mode_debug=False, logger=None, max_workers=None):
+        """
+        Descargar imagenes a raw_Capitulo_X/. Retorna list[str] filenames
+        Las paginas se bajan en paralelo (max MAX_DESCARGAS_POR_HOST por host),
+        cada una con sus propios reintentos. El orden lo dan los nombres pagina_XXX
+        """
         raw_dir = os.path.join(content_dir, f'raw_Capitulo_{chapter_num}')
         os.makedirs(raw_dir, exist_ok=True)
         
-        downloaded = []
-        for idx, url in enumerate(image_urls, 1):
-            filename = f'pagina_{idx:03d}.jpg'
-            filepath = os.path.join(raw_dir, filename)
-            
-            max_retries = 5
-            for attempt in range(1, max_retries + 1):
-                try:
-                    response = requests.get(url, timeout=30)
-                    response.raise_for_status()
-                    
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
+        if max_workers is None:
+            max_workers = MAX_DESCARGAS_POR_HOST
+        max_workers = max(1, min(max_workers, len(image_urls) or 1))
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='img') as pool:
+            futuros = [
+                pool.submit(BaseDownloader._download_page, url, idx, chapter_num, raw_dir, mode_debug, logger)
+                for idx, url in enumerate(image_urls, 1)
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+        
+        return [filename for filename in resultados if filename]
+    
+    @staticmethod
+    def _download_page(url, idx, chapter_num, raw_dir, mode_debug=False, logger=None):
+        """Descargar una pagina con reintentos propios. Retorna filename o None"""
+        filename = f'pagina_{idx:03d}.jpg'
+        filepath = os.path.join(raw_dir, filename)
+        
+        max_retries = 5
+        for attempt in range(1, max_retries + 1):
+            try:
+                with semaforo_host(url):
+                    limiter = get_limiter('imagenes', url)
+                    limiter.esperar()
+                    with http_pool.get(url, 'imagenes', timeout=30, stream=True) as response:
+                        limiter.registrar_respuesta(response, mode_debug=mode_debug, logger=logger)
+                        response.raise_for_status()
+                        BaseDownloader.guardar_respuesta(response, filepath)
+                
+                msg = f"  [OK] {filename}"
+                print(msg)
+                if logger:
+                    logger.log(msg)
+                
+                return filename
+                
+            except Exception as e:
+                if attempt < max_retries:
+                    msg = f"  [WARN] Descarga {idx} fallo (intento {attempt}/{max_retries}): {e}"
+                    if mode_debug:
+                        print(msg)
+                    if logger:
+                        logger.log(msg)
                     
-                    downloaded.append(filename)
+                    msg = f"  [INFO] Reintentando en 5 segundos..."
+                    if mode_debug:
+                        print(msg)
+                    if logger:
+                        logger.log(msg)
                     
-                    msg = f"  [OK] {filename}"
+                    time.sleep(5)
+                else:
+                    msg = f"  [ERROR] Fallo al descargar en el capitulo {chapter_num} la imagen {idx}. Fallo tras {max_retries} intentos: {e}"
                     print(msg)
                     if logger:
                         logger.log(msg)
-                    
-                    time.sleep(0.5)
-                    break
-                    
-                except Exception as e:
-                    if attempt < max_retries:
-                        msg = f"  [WARN] Descarga {idx} fallo (intento {attempt}/{max_retries}): {e}"
-                        if mode_debug:
-                            print(msg)
-                        if logger:
-                            logger.log(msg)
-                        
-                        msg = f"  [INFO] Reintentando en 5 segundos..."
-                        if mode_debug:
-                            print(msg)
-                        if logger:
-                            logger.log(msg)
-                        
-                        time.sleep(5)
-                    else:
-                        msg = f"  [ERROR] Fallo al descargar en el capitulo {chapter_num} la imagen {idx}. Fallo tras {max_retries} intentos: {e}"
-                        print(msg)
-                        if logger:
-                            logger.log(msg)
         
-        return downloaded
+        return None
+    
+    @staticmethod
+    def guardar_respuesta(response, filepath, validar=None):
+        """
+        Volcar una respuesta (stream=True) a disco por bloques.
+        Se escribe en filepath.part y se renombra al final (atomico), asi nunca
+        queda una pagina a medias. validar(path_temporal) puede lanzar excepcion
+        para descartar el fichero antes del rename, o retornar otro path destino
+        (p.ej. con la extension real). Retorna el path final
+        """
+        temporal = filepath + '.part'
+        
+        try:
+            with open(temporal, 'wb') as f:
+                for bloque in response.iter_content(chunk_size=CHUNK_DESCARGA):
+                    if bloque:
+                        f.write(bloque)
+            
+            if validar:
+                filepath = validar(temporal) or filepath
+            
+            os.replace(temporal, filepath)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        
+        return filepath
     
     @staticmethod
     def create_chapter_html(chapter_num, image_files, prev_chapter, next_chapter, manga_data, content_dir, logger=None):
         """Crear capitulo_X.html"""
-        template_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                                      'templates', 'capitulo_template.html')
-        
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
+        template = cargar_plantilla('capitulo_template.html')
         
-        images_html = ''
-        for img in image_files:
-            images_html += f'        <img src="raw_Capitulo_{chapter_num}/{img}" alt="Pagina" loading="lazy">\n'
+        images_html = ''.join(
+            f'        <img src="raw_Capitulo_{chapter_num}/{img}" alt="Pagina" loading="lazy">\n'
+            for img in image_files
+        )
         
-        html = template.replace('{{MANGA_TITLE}}', manga_data['title'])
-        html = html.replace('{{CHAPTER_NUM}}', str(chapter_num))
-        html = html.replace('{{IMAGES}}', images_html)
-        html = html.replace('{{MANGA_ID}}', str(manga_data['id']))
-        html = html.replace('{{PREV_CHAPTER}}', prev_chapter if prev_chapter else '#')
-        html = html.replace('{{NEXT_CHAPTER}}', next_chapter if next_chapter else '#')
-        html = html.replace('{{PREV_DISABLED}}', '' if prev_chapter else 'disabled')
-        html = html.replace('{{NEXT_DISABLED}}', '' if next_chapter else 'disabled')
+        html = template.render(
+            MANGA_TITLE=manga_data['title'],
+            CHAPTER_NUM=chapter_num,
+            IMAGES=images_html,
+            MANGA_ID=manga_data['id'],
+            PREV_CHAPTER=prev_chapter if prev_chapter else '#',
+            NEXT_CHAPTER=next_chapter if next_chapter else '#',
+            PREV_DISABLED='' if prev_chapter else 'disabled',
+            NEXT_DISABLED='' if next_chapter else 'disabled'
+        )
         
         filepath = os.path.join(content_dir, f'capitulo_{chapter_num}.html')
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html)
+        guardar_html(filepath, html)
+        registrar_capitulo(content_dir, chapter_num)
         
         msg = f"[OK] Creado capitulo_{chapter_num}.html"
         print(msg)
@@ -126,19 +194,12 @@ class BaseDownloader(ABC):
     @staticmethod
     def create_index_html(manga_data, logger=None):
         """Crear index.html en raiz manga"""
-        template_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                                      'templates', 'manga_index.html')
-        
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
-        
-        html = template.replace('{{MANGA_ID}}', str(manga_data['id']))
-        html = html.replace('{{MANGA_TITLE}}', manga_data['title'])
+        template = cargar_plantilla('manga_index.html')
+        html = template.render(MANGA_ID=manga_data['id'], MANGA_TITLE=manga_data['title'])
         
         local_path = manga_data['local_storage_path']
         filepath = os.path.join(local_path, 'index.html')
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html)
+        guardar_html(filepath, html)
         
         msg = f"[OK] Creado index.html en {local_path}"
         print(msg)
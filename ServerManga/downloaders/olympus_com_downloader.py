@@ -1,5 +1,6 @@
 from downloaders.base_downloader import BaseDownloader
 from database.db_manager import DatabaseManager
+from utils.rate_limiter import get_limiter
 from checkers.olympus_com_api_client import OlympusComAPIClient
 import os
 import time
@@ -316,6 +317,10 @@ class OlympusComDownloader(BaseDownloader):
             if logger:
                 logger.log(msg)
             
+            # Ritmo entre capitulos: rate limiter por host (antes pausa fija de 30s)
+            limiter = get_limiter('olympus_com', chapter_url)
+            limiter.esperar()
+            
             max_retries = 5
             page = None
             
@@ -329,7 +334,13 @@ class OlympusComDownloader(BaseDownloader):
                             logger.log(msg)
                     
                     page = browser.new_page()
-                    page.goto(chapter_url, timeout=30000)
+                    respuesta = page.goto(chapter_url, timeout=30000)
+                    
+                    # Solo un bloqueo (403/429/5xx/Cloudflare) frena el host;
+                    # los fallos de extraccion, imagenes o disco no dicen nada del ritmo
+                    if limiter.registrar_navegacion(respuesta, mode_debug, logger):
+                        raise Exception(f"Bloqueo del servidor (HTTP {respuesta.status})")
+                    
                     page.wait_for_load_state('networkidle')
                     
                     msg = "Extrayendo imagenes..."
@@ -397,15 +408,6 @@ class OlympusComDownloader(BaseDownloader):
                         import traceback
                         traceback.print_exc()
                         break
-            
-            if i < len(capitulos_ordenados) - 1:
-                msg = "[INFO] Pausa 30 segundos..."
-                if mode_debug:
-                    print(msg)
-                if logger:
-                    logger.log(msg)
-                
-                time.sleep(30)
         
         if last_chapter_url:
             msg = f"\nActualizando last_download_url..."
@@ -1,6 +1,7 @@
 from downloaders.base_downloader import BaseDownloader
 from database.db_manager import DatabaseManager
-import requests
+from utils.rate_limiter import get_limiter
+from utils import http_pool
 import re
 import os
 
@@ -283,6 +284,10 @@ class OlympusNetDownloader(BaseDownloader):
             if logger:
                 logger.log(msg)
             
+            # Ritmo entre capitulos: rate limiter por host (antes pausa fija de 30s)
+            limiter = get_limiter('olympus_net', chapter_url)
+            limiter.esperar()
+            
             max_retries = 5
             page = None
             
@@ -296,7 +301,13 @@ class OlympusNetDownloader(BaseDownloader):
                             logger.log(msg)
                     
                     page = browser.new_page()
-                    page.goto(chapter_url, timeout=30000)
+                    respuesta = page.goto(chapter_url, timeout=30000)
+                    
+                    # Solo un bloqueo (403/429/5xx/Cloudflare) frena el host;
+                    # los fallos de extraccion, imagenes o disco no dicen nada del ritmo
+                    if limiter.registrar_navegacion(respuesta, mode_debug, logger):
+                        raise Exception(f"Bloqueo del servidor (HTTP {respuesta.status})")
+                    
                     page.wait_for_load_state('networkidle')
                     
                     msg = "Extrayendo imagenes..."
@@ -365,16 +376,6 @@ class OlympusNetDownloader(BaseDownloader):
                         import traceback
                         traceback.print_exc()
                         break
-            
-            if i < len(capitulos_ordenados) - 1:
-                msg = "[INFO] Pausa 30 segundos..."
-                if mode_debug:
-                    print(msg)
-                if logger:
-                    logger.log(msg)
-                
-                import time
-                time.sleep(30)
         
         if last_chapter_url:
             msg = f"\nActualizando last_download_url..."
@@ -434,7 +435,7 @@ class OlympusNetDownloader(BaseDownloader):
                 if logger:
                     logger.log(msg)
                 
-                response = requests.get(api_url, timeout=15)
+                response = http_pool.get(api_url, 'olympus_net', timeout=15)
                 response.raise_for_status()
                 data = response.json()
                 
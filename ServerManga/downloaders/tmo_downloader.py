@@ -1,14 +1,28 @@
-from downloaders.base_downloader import BaseDownloader
+from downloaders.base_downloader import BaseDownloader, MAX_DESCARGAS_POR_HOST, semaforo_host
 from database.db_manager import DatabaseManager
+from utils.rate_limiter import get_limiter
 import requests
+from utils import http_pool
 import re
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
-import io
 
 class TmoDownloader(BaseDownloader):
     
+    # True -> se guardan los bytes originales con su extension real si el formato
+    # lo sirve el navegador tal cual; solo se re-codifica a JPEG lo demas
+    CONSERVAR_ORIGINAL = True
+    
+    # Formato PIL -> extension guardada sin re-codificar
+    FORMATOS_DIRECTOS = {
+        'JPEG': 'jpg',
+        'PNG': 'png',
+        'WEBP': 'webp',
+        'GIF': 'gif',
+    }
+    
     @staticmethod
     def download_full_manga(manga_data, start_chapter, browser, mode_debug=False, logger=None):
         """No implementado para TMO (usar download_chapters_list)"""
@@ -71,6 +85,10 @@ class TmoDownloader(BaseDownloader):
             if logger:
                 logger.log(msg)
             
+            # Ritmo entre capitulos: rate limiter por host (antes pausa fija de 30s)
+            limiter = get_limiter('tmo', chapter_url)
+            limiter.esperar()
+            
             # Reintentar hasta 5 veces
             max_retries = 5
             page = None
@@ -119,7 +137,13 @@ class TmoDownloader(BaseDownloader):
                         logger.log(msg)
                     
                     page = browser.new_page()
-                    page.goto(real_url, timeout=30000)
+                    respuesta = page.goto(real_url, timeout=30000)
+                    
+                    # Solo un bloqueo (403/429/5xx/Cloudflare) frena el host;
+                    # los fallos de extraccion, imagenes o disco no dicen nada del ritmo
+                    if limiter.registrar_navegacion(respuesta, mode_debug, logger):
+                        raise Exception(f"Bloqueo del servidor (HTTP {respuesta.status})")
+                    
                     page.wait_for_load_state('networkidle')
                     
                     msg = "Extrayendo imagenes..."
@@ -203,15 +227,6 @@ class TmoDownloader(BaseDownloader):
                 if logger:
                     logger.log(msg)
                 break
-            
-            # Pausa entre capitulos (si no es el ultimo)
-            if i < len(capitulos_ordenados) - 1:
-                msg = "[INFO] Pausa 30 segundos..."
-                if mode_debug:
-                    print(msg)
-                if logger:
-                    logger.log(msg)
-                time.sleep(30)
         
         # Actualizar DB SOLO con ultimo exitoso
         if last_chapter_url:
@@ -265,93 +280,125 @@ class TmoDownloader(BaseDownloader):
         raw_dir = os.path.join(content_dir, f'raw_Capitulo_{chapter_num}')
         os.makedirs(raw_dir, exist_ok=True)
         
-        headers = {
-            "authority": "cache3.img1tmo.com",
-            "accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8",
-            "accept-language": "es-ES,es;q=0.9",
-            "referer": "https://zonatmo.com/",
-            "sec-ch-ua": '"Chromium";v="142", "Brave";v="142", "Not_A Brand";v="99"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"Windows"',
-            "sec-fetch-dest": "image",
-            "sec-fetch-mode": "no-cors",
-            "sec-fetch-site": "cross-site",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-        }
+        max_workers = max(1, min(MAX_DESCARGAS_POR_HOST, len(image_urls) or 1))
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tmo-img')
         
+        try:
+            futuros = [
+                pool.submit(TmoDownloader._tmo_download_page, url, idx, raw_dir, mode_debug, logger)
+                for idx, url in enumerate(image_urls, 1)
+            ]
+            # En orden: si una pagina falla del todo se cancela el resto y se relanza
+            # para que download_chapters_list reintente el capitulo completo
+            downloaded = [futuro.result() for futuro in futuros]
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        
+        return downloaded
+    
+    @staticmethod
+    def _tmo_download_page(url, idx, raw_dir, mode_debug=True, logger=None):
+        """
+        Descargar y validar una pagina. Los errores de red se reintentan aqui;
+        si persisten (o la imagen no es valida) se lanza la excepcion
+        """
         LOADING_URL_PART = "loading.gif"
         MIN_DIMENSION_PIXELS = 400
-        downloaded = []
+        max_retries = 3
         
-        for idx, url in enumerate(image_urls, 1):                   
-            filename = f'pagina_{idx:03d}.jpg'
-            filepath = os.path.join(raw_dir, filename)
-            
-            # Sin bucle de reintento interno; la excepción la maneja download_chapters_list
+        base_path = os.path.join(raw_dir, f'pagina_{idx:03d}')
+        filepath = base_path + '.jpg'
+        
+        for attempt in range(1, max_retries + 1):
             try:                    
                 # 1. VERIFICACIÓN DE URL
                 if LOADING_URL_PART in url.lower():
                     # Lanza la excepción para reintentar el capítulo completo
                     raise ValueError(f"URL de imagen {idx} contiene '{LOADING_URL_PART}'.")
                 
-                response = requests.get(url, headers=headers)
-                response.raise_for_status() 
-                
-                # 2. VERIFICACIÓN DE DIMENSIONES (Usando Pillow)
-                image_data = io.BytesIO(response.content)
-                img = Image.open(image_data)
-                width, height = img.size
-                
-                if width < MIN_DIMENSION_PIXELS and height < MIN_DIMENSION_PIXELS:
-                    raise ValueError(f"Dimensión de imagen {idx} ({width}x{height}) es menor que {MIN_DIMENSION_PIXELS}px.")
-
-                # 3. GUARDAR IMAGEN REAL
-                # Convertir a JPEG antes de guardar si no lo es, ya que el filename es .jpg
-                img.convert('RGB').save(filepath, 'JPEG')
-
-                downloaded.append(filename)
+                dimensiones = []
                 
+                def _validar(temporal):
+                    # 2. VERIFICACIÓN DE DIMENSIONES (Pillow solo lee la cabecera del fichero)
+                    with Image.open(temporal) as img:
+                        width, height = img.size
+                        dimensiones.append((width, height))
+                        
+                        if width < MIN_DIMENSION_PIXELS and height < MIN_DIMENSION_PIXELS:
+                            raise ValueError(f"Dimensión de imagen {idx} ({width}x{height}) es menor que {MIN_DIMENSION_PIXELS}px.")
+                        
+                        # 3. GUARDAR IMAGEN REAL
+                        # Formato servible: bytes originales con su extension (sin decodificar)
+                        extension = TmoDownloader.FORMATOS_DIRECTOS.get(img.format)
+                        if TmoDownloader.CONSERVAR_ORIGINAL and extension:
+                            return f"{base_path}.{extension}"
+                        
+                        # Resto: convertir a JPEG
+                        convertido = temporal + '.jpg'
+                        try:
+                            img.convert('RGB').save(convertido, 'JPEG')
+                        except BaseException:
+                            if os.path.exists(convertido):
+                                os.remove(convertido)
+                            raise
+                    os.replace(convertido, temporal)
+                    return filepath
+                
+                with semaforo_host(url):
+                    limiter = get_limiter('imagenes', url)
+                    limiter.esperar()
+                    with http_pool.get(url, 'tmo_imagenes', timeout=30, stream=True) as response:
+                        limiter.registrar_respuesta(response, mode_debug=mode_debug, logger=logger)
+                        response.raise_for_status()
+                        # Volcado por bloques a .part, validacion y rename atomico
+                        destino = BaseDownloader.guardar_respuesta(response, filepath, validar=_validar)
+                
+                width, height = dimensiones[0]
+                filename = os.path.basename(destino)
                 msg = f"  [OK] {filename} (Dim: {width}x{height})"
                 print(msg)
                 if logger:
                     logger.log(msg)
                 
-                time.sleep(0.5)
+                return filename
+                
+            except requests.RequestException as e:
+                if attempt < max_retries:
+                    msg = f"  [WARN] Imagen {idx} fallo (intento {attempt}/{max_retries}): {e}"
+                    if mode_debug:
+                        print(msg)
+                    if logger:
+                        logger.log(msg)
+                    time.sleep(2)
+                    continue
+                
+                msg = f"  [ERROR] Fallo al descargar la imagen {idx}: {e}"
+                print(msg)
+                if logger:
+                    logger.log(msg)
+                raise # Relanzar la excepción para el reintento a nivel de capítulo
                 
             except Exception as e:
-                # Relanzar la excepción para que la capture download_chapters_list
+                # Imagen invalida: no tiene sentido reintentar solo la pagina
                 msg = f"  [ERROR] Fallo al descargar la imagen {idx}: {e}"
                 print(msg)
                 if logger:
                     logger.log(msg)
                 raise # Relanzar la excepción para el reintento a nivel de capítulo
-        
-        return downloaded
  
     @staticmethod
     def _get_real_viewer_url(upload_id, logger=None):
         """Obtener URL real del visor mediante redirect"""
         base_url = f"https://zonatmo.com/view_uploads/{upload_id}"
         
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                          "AppleWebKit/537.36 (KHTML, like Gecko) "
-                          "Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,"
-                      "image/avif,image/webp,image/apng,*/*;q=0.8",
-            "Accept-Language": "es-ES,es;q=0.9",
-            "Referer": "https://zonatmo.com/",
-            "Upgrade-Insecure-Requests": "1",
-            "DNT": "1"
-        }
-        
         try:
-            response = requests.get(
+            response = http_pool.get(
                 base_url,
+                'tmo',
                 allow_redirects=False,
-                headers=headers,
                 timeout=10
             )
+            get_limiter('tmo', base_url).registrar_respuesta(response, logger=logger)
             
             if response.status_code not in (301, 302):
                 msg = f"[WARN] Respuesta inesperada: {response.status_code}"
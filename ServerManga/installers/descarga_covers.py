@@ -14,7 +14,9 @@ sys.path.insert(0, base_dir)
 from database.db_manager import DatabaseManager
 from checkers.olympus_com_api_client import OlympusComAPIClient
 from server.server_utils import generar_index_principal
-import requests
+from utils import http_pool
+from utils.html_gzip import guardar_html
+from utils.portadas import portada_registrada
 
 def descargar_todos_covers():
     """Descargar covers de todos los mangas olympus_com"""
@@ -77,7 +79,7 @@ def descargar_todos_covers():
         cover_path = os.path.join(manga_dir, 'portada.webp')
         
         # Si ya existe, skip
-        if os.path.exists(cover_path):
+        if portada_registrada(manga, db):
             print(f"  [INFO] Cover ya existe")
             ya_existian += 1
             continue
@@ -85,12 +87,13 @@ def descargar_todos_covers():
         # Descargar
         try:
             print(f"  [INFO] Descargando...")
-            response = requests.get(cover_url, timeout=15)
+            response = http_pool.get(cover_url, 'covers', timeout=15)
             response.raise_for_status()
             
             with open(cover_path, 'wb') as f:
                 f.write(response.content)
             
+            db.update_cover_path(mid, 'portada.webp')
             print(f"  [OK] Descargado: {cover_path}")
             descargados += 1
             
@@ -125,8 +128,7 @@ def main():
         index_html = generar_index_principal()
         
         index_path = os.path.join(base_dir, 'index.html')
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(index_html)
+        guardar_html(index_path, index_html)
         
         print(f"[OK] Index regenerado: {index_path}")
         
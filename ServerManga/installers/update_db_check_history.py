@@ -0,0 +1,20 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+
+def main():
+    print("Creando tabla check_history...")
+    
+    db = DatabaseManager()
+    
+    try:
+        db.add_check_history_table()
+        print("[OK] Tabla check_history creada exitosamente")
+    except Exception as e:
+        print(f"[ERROR] {e}")
+
+if __name__ == '__main__':
+    main()
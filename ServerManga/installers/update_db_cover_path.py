@@ -0,0 +1,20 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+
+def main():
+    print("Agregando columna cover_path...")
+    
+    db = DatabaseManager()
+    db.add_cover_path_column()
+    
+    # Registrar portadas que ya estan en disco (por si la columna ya existia sin rellenar)
+    registradas = db.registrar_portadas_en_disco()
+    
+    print(f"[OK] {registradas} portada(s) registradas")
+
+if __name__ == '__main__':
+    main()
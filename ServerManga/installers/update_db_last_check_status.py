@@ -0,0 +1,15 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+
+def main():
+    print("Agregando columna last_check_status...")
+    
+    db = DatabaseManager()
+    db.add_last_check_status_column()
+
+if __name__ == '__main__':
+    main()
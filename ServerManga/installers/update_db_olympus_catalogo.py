@@ -0,0 +1,16 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+
+def main():
+    print("Creando tablas olympus_catalogo...")
+    
+    db = DatabaseManager()
+    db.add_olympus_catalogo_table()
+    print("[OK] Tablas olympus_catalogo creadas")
+
+if __name__ == '__main__':
+    main()
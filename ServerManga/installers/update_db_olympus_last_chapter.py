@@ -0,0 +1,18 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+
+def main():
+    print("Agregando columnas olympus_last_chapter_id/_num...")
+    
+    db = DatabaseManager()
+    db.add_olympus_last_chapter_columns()
+    
+    # El id se aprende en el siguiente check; el numero sale de last_checked_chapter
+    print("[OK] La marca se completara en el proximo chequeo de olympus_com")
+
+if __name__ == '__main__':
+    main()
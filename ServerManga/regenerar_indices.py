@@ -9,16 +9,13 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
 
 from database.db_manager import DatabaseManager
+from utils.html_gzip import guardar_html
+from utils.plantillas import cargar_plantilla
 
 def regenerar_index(manga):
     """Regenerar index.html para un manga"""
-    template_path = os.path.join(BASE_DIR, 'templates', 'manga_index.html')
-    
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template = f.read()
-    
-    html = template.replace('{{MANGA_ID}}', str(manga['id']))
-    html = html.replace('{{MANGA_TITLE}}', manga['title'])
+    template = cargar_plantilla(os.path.join(BASE_DIR, 'templates', 'manga_index.html'))
+    html = template.render(MANGA_ID=manga['id'], MANGA_TITLE=manga['title'])
     
     local_path = manga['local_storage_path']
     index_path = os.path.join(local_path, 'index.html')
@@ -35,8 +32,7 @@ def regenerar_index(manga):
         print(f"[INFO] Backup: index_OLD.html")
     
     # Crear nuevo index
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    guardar_html(index_path, html)
     
     print(f"[OK] Regenerado: {index_path}")
     return True
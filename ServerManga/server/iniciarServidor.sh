@@ -28,8 +28,8 @@ python3 -c "
 import sys
 sys.path.insert(0, '.')
 from server.server_utils import generar_index_principal
-with open('index.html', 'w', encoding='utf-8') as f:
-    f.write(generar_index_principal())
+from utils.html_gzip import guardar_html
+guardar_html('index.html', generar_index_principal())
 print('Index principal generado')
 "
 
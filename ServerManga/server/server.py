@@ -2,25 +2,217 @@
 # -*- coding: utf-8 -*-
 
 from http.server import HTTPServer, SimpleHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+import gzip
+import hashlib
+import io
 import json
 import os
 import sys
+import threading
 from urllib.parse import urlparse, parse_qs
 import re
-import subprocess
+import time
 
 # Resolver imports desde raiz proyecto
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, base_dir)
 
 from database.db_manager import DatabaseManager
+from utils.manifiesto_capitulos import leer_manifiesto
+from server.server_utils import generar_index_principal, regenerar_seccion_pendientes
 db = DatabaseManager()
 
+# Conexiones atendidas a la vez (un capitulo pide decenas de imagenes de golpe)
+MAX_CONEXIONES = int(os.environ.get('MANGA_MAX_CONEXIONES', '16'))
+
+# Conexiones aceptadas esperando hilo libre; por encima se responde 503
+COLA_CONEXIONES = int(os.environ.get('MANGA_COLA_CONEXIONES', '32'))
+RESPUESTA_SATURADO = (b"HTTP/1.1 503 Service Unavailable\r\nRetry-After: 1\r\n"
+                      b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+
+# Cache HTTP
+#   raw_Capitulo_* -> las paginas descargadas no cambian nunca
+#   HTML           -> se regenera, el navegador revalida siempre (ETag -> 304)
+CACHE_INMUTABLE = 'public, max-age=31536000, immutable'
+CACHE_REVALIDAR = 'no-cache'
+CACHE_DEFECTO = 'public, max-age=3600'
+PATRON_INMUTABLE = re.compile(r'(^|/)raw_Capitulo_[^/]+/')
+EXTENSIONES_HTML = ('.html', '.htm')
+
+# HTML precomprimido por utils.html_gzip (index.html -> index.html.gz)
+EXTENSION_GZIP = '.gz'
+
+# Range: solo un rango por peticion ("bytes=inicio-fin", "bytes=inicio-", "bytes=-sufijo")
+PATRON_RANGO = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# ETags de HTML por hash de contenido: {path: ((mtime_ns, size), etag)}
+_etags_html = {}
+_etags_lock = threading.Lock()
+
+# Regeneracion del index.html de disco tras guardar progreso (solo con
+# MANGA_INDEX_DINAMICO=0; por defecto '/' se sirve desde IndexEnMemoria):
+#   se espera RETARDO sin nuevos guardados (un capitulo guarda varias veces al hacer scroll)
+#   pero nunca mas de ESPERA_MAXIMA desde el primer guardado pendiente
+RETARDO_REGENERACION = 5.0
+ESPERA_MAXIMA_REGENERACION = 30.0
+
+class RegeneradorIndex:
+    """
+    Regenera la seccion pendientes del index.html de disco dentro del propio
+    servidor, agrupando rafagas de guardados en una sola escritura.
+    Solo es el fallback con MANGA_INDEX_DINAMICO=0: el camino normal es
+    IndexEnMemoria, que no reescribe el index.html
+    """
+    
+    def __init__(self, retardo=RETARDO_REGENERACION, espera_maxima=ESPERA_MAXIMA_REGENERACION):
+        self.retardo = retardo
+        self.espera_maxima = espera_maxima
+        self._timer = None
+        self._primer_aviso = None
+        self._lock = threading.Lock()
+        self._lock_escritura = threading.Lock()
+    
+    def programar(self):
+        """Pedir una regeneracion (reinicia la cuenta atras)"""
+        with self._lock:
+            ahora = time.monotonic()
+            if self._primer_aviso is None:
+                self._primer_aviso = ahora
+            if self._timer:
+                self._timer.cancel()
+            
+            restante = self._primer_aviso + self.espera_maxima - ahora
+            self._timer = threading.Timer(max(0.0, min(self.retardo, restante)), self._ejecutar)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _ejecutar(self):
+        with self._lock:
+            self._timer = None
+            self._primer_aviso = None
+        
+        # Un solo hilo reescribiendo index.html a la vez
+        with self._lock_escritura:
+            try:
+                regenerar_seccion_pendientes()
+                print("[INDEX] Seccion pendientes regenerada")
+            except Exception as e:
+                print(f"[WARN] Error regenerando index: {e}")
+
+regenerador = RegeneradorIndex()
+
+# Index dinamico: '/' se genera en memoria desde la DB en vez de leer index.html
+# (MANGA_INDEX_DINAMICO=0 -> volver al index.html de disco)
+INDEX_DINAMICO = os.environ.get('MANGA_INDEX_DINAMICO', '1') != '0'
+RUTAS_INDEX = ('/', '/index.html')
+
+class IndexEnMemoria:
+    """
+    Index principal renderizado y cacheado en memoria.
+    Se invalida solo cuando cambia la DB (manga_tracker.db o su -wal),
+    da igual que proceso la escriba (bot, workers o el propio servidor)
+    """
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._firma = None
+        self._render = None
+        self._lock = threading.Lock()
+    
+    def firma(self):
+        """(mtime, tamano) de la DB y del WAL: cualquier commit cambia alguno"""
+        partes = []
+        for ruta in (self.db_path, self.db_path + '-wal'):
+            try:
+                st = os.stat(ruta)
+                partes.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                partes.append(None)
+        return tuple(partes)
+    
+    def invalidar(self):
+        with self._lock:
+            self._firma = None
+    
+    def obtener(self):
+        """Render actual: {'html', 'gzip', 'etag', 'etag_gzip'}"""
+        firma = self.firma()
+        
+        # Un solo render a la vez: el resto de peticiones esperan y reutilizan
+        with self._lock:
+            if self._render and self._firma == firma:
+                return self._render
+            
+            html = generar_index_principal().encode('utf-8')
+            digest = hashlib.sha1(html).hexdigest()
+            self._render = {
+                'html': html,
+                'gzip': gzip.compress(html, compresslevel=9, mtime=0),
+                'etag': f'"{digest}"',
+                'etag_gzip': f'"{digest}-gz"'
+            }
+            self._firma = firma
+            return self._render
+
+index_memoria = IndexEnMemoria(db.db_path)
+
+class ServidorConcurrente(HTTPServer):
+    """
+    HTTPServer que atiende cada conexion en un pool de hilos acotado
+    (en vez de una peticion detras de otra)
+    """
+    request_queue_size = 64
+    
+    def __init__(self, server_address, handler_class, max_conexiones=MAX_CONEXIONES, cola=COLA_CONEXIONES):
+        super().__init__(server_address, handler_class)
+        self.max_conexiones = max_conexiones
+        self._pool = ThreadPoolExecutor(max_workers=max_conexiones, thread_name_prefix='http')
+        # Tope de conexiones en el pool (atendiendose + en cola): la cola del
+        # executor no tiene limite y cada conexion retiene su descriptor
+        self._plazas = threading.BoundedSemaphore(max_conexiones + cola)
+    
+    def process_request(self, request, client_address):
+        if not self._plazas.acquire(blocking=False):
+            self._rechazar(request)
+            return
+        try:
+            self._pool.submit(self._atender, request, client_address)
+        except RuntimeError:
+            # Pool cerrado (server_close)
+            self._plazas.release()
+            self.shutdown_request(request)
+    
+    def _rechazar(self, request):
+        """Servidor saturado: 503 y cerrar sin ocupar un hilo"""
+        try:
+            request.sendall(RESPUESTA_SATURADO)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+    
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._plazas.release()
+    
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
 class MiServidor(SimpleHTTPRequestHandler):
     """
     Servidor HTTP multi-manga con API progreso
     """
     
+    # Estaticos con socket.sendfile (el kernel copia fichero -> socket sin pasar por Python)
+    USAR_SENDFILE = True
+    
     def translate_path(self, path):
         """
         Traduce URLs a paths del filesystem
@@ -40,6 +232,296 @@ class MiServidor(SimpleHTTPRequestHandler):
         
         return full_path
     
+    def send_head(self):
+        """
+        Igual que SimpleHTTPRequestHandler.send_head pero con ETag/Cache-Control
+        y 304 si el navegador ya tiene la version actual
+        """
+        self._cabeceras_cache = None
+        self._rango = None
+        self._gzip = False
+        
+        if INDEX_DINAMICO and urlparse(self.path).path in RUTAS_INDEX:
+            return self.servir_index_dinamico()
+        
+        path = self.translate_path(self.path)
+        barra_final = urlparse(self.path).path.endswith('/')
+        
+        # Directorio con index -> se sirve el index por la misma via
+        if os.path.isdir(path) and barra_final:
+            for index in ('index.html', 'index.htm'):
+                if os.path.isfile(os.path.join(path, index)):
+                    path = os.path.join(path, index)
+                    barra_final = False
+                    break
+        
+        # Redirecciones, listados y fichero pedido con barra final -> clase base
+        if not os.path.isfile(path) or barra_final:
+            return super().send_head()
+        
+        tipo = self.guess_type(path)
+        self._cabeceras_cache = {'Cache-Control': self.politica_cache(path)}
+        
+        # HTML: variante .gz si el cliente la acepta (se comprimio al generarlo)
+        if path.endswith(EXTENSIONES_HTML):
+            self._cabeceras_cache['Vary'] = 'Accept-Encoding'
+            comprimido = self.variante_gzip(path)
+            if comprimido:
+                path = comprimido
+                self._gzip = True
+        
+        try:
+            st = os.stat(path)
+            etag = self.calcular_etag(path, st)
+        except OSError:
+            self._cabeceras_cache = None
+            return super().send_head()
+        
+        self._cabeceras_cache['ETag'] = etag
+        
+        if self.etag_coincide(etag):
+            self.send_response(304)
+            self.end_headers()
+            return None
+        
+        return self.servir_fichero(path, st, etag, tipo)
+    
+    def servir_index_dinamico(self):
+        """Index principal desde memoria (ETag/304 y gzip igual que los estaticos)"""
+        render = index_memoria.obtener()
+        
+        self._gzip = self.acepta_gzip()
+        cuerpo = render['gzip'] if self._gzip else render['html']
+        etag = render['etag_gzip'] if self._gzip else render['etag']
+        
+        self._cabeceras_cache = {
+            'Cache-Control': CACHE_REVALIDAR,
+            'Vary': 'Accept-Encoding',
+            'ETag': etag
+        }
+        
+        if self.etag_coincide(etag):
+            self.send_response(304)
+            self.end_headers()
+            return None
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        if self._gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        return io.BytesIO(cuerpo)
+    
+    def variante_gzip(self, path):
+        """
+        Ruta del .gz si el cliente acepta gzip y el .gz no es mas viejo que el HTML
+        (scripts que escriban el HTML a mano dejan el .gz desfasado)
+        """
+        if not self.acepta_gzip():
+            return None
+        
+        comprimido = path + EXTENSION_GZIP
+        try:
+            if os.stat(comprimido).st_mtime_ns >= os.stat(path).st_mtime_ns:
+                return comprimido
+        except OSError:
+            pass
+        return None
+    
+    def acepta_gzip(self):
+        """Accept-Encoding incluye gzip (sin q=0)"""
+        for parte in self.headers.get('Accept-Encoding', '').split(','):
+            trozos = [t.strip() for t in parte.split(';')]
+            if trozos[0].lower() not in ('gzip', '*'):
+                continue
+            q = next((t[2:] for t in trozos[1:] if t.startswith('q=')), '1')
+            try:
+                return float(q) > 0
+            except ValueError:
+                return False
+        return False
+    
+    def servir_fichero(self, path, st, etag, tipo):
+        """
+        Cabeceras de un estatico (200, 206 o 416) y fichero abierto para copyfile.
+        Deja en self._rango el (offset, longitud) a enviar
+        """
+        if self.no_modificado(st):
+            self.send_response(304)
+            self.end_headers()
+            return None
+        
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        
+        tamano = st.st_size
+        rango = self.leer_rango(tamano, etag)
+        
+        if rango == 'invalido':
+            f.close()
+            self._rango = None
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{tamano}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+        
+        try:
+            if rango:
+                inicio, fin = rango
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {inicio}-{fin}/{tamano}')
+            else:
+                inicio, fin = 0, tamano - 1
+                self.send_response(200)
+            
+            self._rango = (inicio, fin - inicio + 1)
+            self.send_header('Content-Type', tipo)
+            if self._gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(fin - inicio + 1))
+            self.send_header('Last-Modified', formatdate(st.st_mtime, usegmt=True))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+    
+    def no_modificado(self, st):
+        """If-Modified-Since (solo si no vino If-None-Match, como la clase base)"""
+        if 'If-None-Match' in self.headers:
+            return False
+        valor = self.headers.get('If-Modified-Since')
+        if not valor:
+            return False
+        try:
+            fecha = parsedate_to_datetime(valor)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if fecha is None:
+            return False
+        return int(st.st_mtime) <= fecha.timestamp()
+    
+    def leer_rango(self, tamano, etag):
+        """
+        Parsear la cabecera Range.
+        Retorna None (fichero entero), (inicio, fin) inclusivo o 'invalido' (-> 416)
+        """
+        valor = self.headers.get('Range')
+        if not valor:
+            return None
+        
+        # If-Range con otra version -> fichero entero
+        if_range = self.headers.get('If-Range')
+        if if_range and if_range.strip() != etag:
+            return None
+        
+        m = PATRON_RANGO.match(valor.strip())
+        if not m or (not m.group(1) and not m.group(2)):
+            # Multi-rango o formato raro: se ignora y va entero
+            return None
+        
+        if m.group(1):
+            inicio = int(m.group(1))
+            fin = int(m.group(2)) if m.group(2) else tamano - 1
+        else:
+            sufijo = int(m.group(2))
+            if sufijo == 0:
+                return 'invalido'
+            inicio = max(0, tamano - sufijo)
+            fin = tamano - 1
+        
+        if inicio >= tamano or fin < inicio:
+            return 'invalido'
+        return inicio, min(fin, tamano - 1)
+    
+    def copyfile(self, source, outputfile):
+        """
+        Enviar el estatico: sendfile del rango pedido, o copia por trozos
+        si sendfile no esta disponible
+        """
+        rango = getattr(self, '_rango', None)
+        self._rango = None
+        
+        if rango is None:
+            return super().copyfile(source, outputfile)
+        
+        offset, longitud = rango
+        if longitud <= 0:
+            return
+        
+        if self.USAR_SENDFILE:
+            outputfile.flush()
+            self.connection.sendfile(source, offset, longitud)
+            return
+        
+        source.seek(offset)
+        restante = longitud
+        while restante > 0:
+            bloque = source.read(min(65536, restante))
+            if not bloque:
+                break
+            outputfile.write(bloque)
+            restante -= len(bloque)
+    
+    def end_headers(self):
+        """Anadir cabeceras de cache pendientes antes de cerrar cabeceras"""
+        cabeceras = getattr(self, '_cabeceras_cache', None)
+        if cabeceras:
+            for nombre, valor in cabeceras.items():
+                self.send_header(nombre, valor)
+            self._cabeceras_cache = None
+        super().end_headers()
+    
+    @staticmethod
+    def politica_cache(path):
+        """Cache-Control segun el tipo de fichero"""
+        if PATRON_INMUTABLE.search(path.replace(os.sep, '/')):
+            return CACHE_INMUTABLE
+        if path.endswith(EXTENSIONES_HTML):
+            return CACHE_REVALIDAR
+        return CACHE_DEFECTO
+    
+    @staticmethod
+    def calcular_etag(path, st):
+        """
+        ETag fuerte. HTML: hash del contenido (se regenera a menudo con el mismo
+        contenido). Resto: tamano + mtime, sin leer el fichero
+        """
+        if not path.endswith(EXTENSIONES_HTML):
+            return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+        
+        firma = (st.st_mtime_ns, st.st_size)
+        with _etags_lock:
+            cacheado = _etags_html.get(path)
+        if cacheado and cacheado[0] == firma:
+            return cacheado[1]
+        
+        h = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for bloque in iter(lambda: f.read(65536), b''):
+                h.update(bloque)
+        etag = f'"{h.hexdigest()}"'
+        
+        with _etags_lock:
+            _etags_html[path] = (firma, etag)
+        return etag
+    
+    def etag_coincide(self, etag):
+        """If-None-Match contiene el ETag actual (o '*')"""
+        valor = self.headers.get('If-None-Match')
+        if not valor:
+            return False
+        if valor.strip() == '*':
+            return True
+        candidatos = [v.strip().removeprefix('W/') for v in valor.split(',')]
+        return etag in candidatos
+    
     def do_GET(self):
         """
         Maneja peticiones GET con manejo de errores de conexion
@@ -50,6 +532,8 @@ class MiServidor(SimpleHTTPRequestHandler):
             # API endpoints
             if parsed_path.path == '/api/progreso':
                 self.manejar_api_progreso(parsed_path)
+            elif parsed_path.path == '/api/capitulos':
+                self.manejar_api_capitulos(parsed_path)
             elif parsed_path.path == '/guardar_progreso':
                 self.manejar_guardar_progreso(parsed_path)
             else:
@@ -108,6 +592,44 @@ class MiServidor(SimpleHTTPRequestHandler):
                 'error': str(e)
             }, 500)
     
+    def manejar_api_capitulos(self, parsed_path):
+        """
+        GET /api/capitulos?manga_id=X
+        Retorna los capitulos descargados (manifiesto cacheado, sin listar contenido/)
+        """
+        params = parse_qs(parsed_path.query)
+        
+        if 'manga_id' not in params:
+            self.send_json_response({
+                'success': False,
+                'error': 'Falta parametro manga_id'
+            }, 400)
+            return
+        
+        try:
+            manga_id = int(params['manga_id'][0])
+            manga = db.get_manga(manga_id=manga_id)
+            
+            if not manga or not manga.get('local_storage_path'):
+                self.send_json_response({
+                    'success': False,
+                    'error': 'Manga no encontrado'
+                }, 404)
+                return
+            
+            content_dir = os.path.join(manga['local_storage_path'], 'contenido')
+            
+            self.send_json_response({
+                'success': True,
+                'capitulos': leer_manifiesto(content_dir)
+            })
+            
+        except Exception as e:
+            self.send_json_response({
+                'success': False,
+                'error': str(e)
+            }, 500)
+    
     def manejar_guardar_progreso(self, parsed_path):
         """
         GET /guardar_progreso?manga_id=X&capitulo=Y
@@ -142,11 +664,11 @@ class MiServidor(SimpleHTTPRequestHandler):
                     'UPDATE manga SET current_reading = ? WHERE id = ?',
                     (capitulo, manga_id)
                 )     
-                
-            subprocess.Popen([
-                'x-terminal-emulator', '-e',
-                'bash', '-c', 'cd /home/pablopi/Server/ServerManga && bash servicios/regenerar_web.sh'
-            ])         
+            
+            # Index dinamico: el UPDATE ya invalida el render en memoria.
+            # Solo sin index dinamico hay que regenerar el index.html de disco
+            if not INDEX_DINAMICO:
+                regenerador.programar()
             
             respuesta = {
                 'success': True,
@@ -182,19 +704,24 @@ class MiServidor(SimpleHTTPRequestHandler):
 
 def main():
     puerto = 8000
+    max_conexiones = MAX_CONEXIONES
+    if len(sys.argv) > 1:
+        max_conexiones = int(sys.argv[1])
     
     print("="*60)
     print("SERVIDOR MULTI-MANGA INICIADO")
     print("="*60)
     print(f"\nDireccion: http://localhost:{puerto}")
     print(f"Sirviendo desde: {base_dir}")
+    print(f"Conexiones simultaneas: {max_conexiones}")
     print(f"\nPresiona Ctrl+C para detener\n")
     print("="*60)
     
     try:
-        servidor = HTTPServer(('', puerto), MiServidor)
+        servidor = ServidorConcurrente(('', puerto), MiServidor, max_conexiones)
         servidor.serve_forever()
     except KeyboardInterrupt:
+        servidor.server_close()
         print("\n\nServidor detenido")
         print("="*60)
 
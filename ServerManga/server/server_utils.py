@@ -9,6 +9,8 @@ base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, base_dir)
 
 from database.db_manager import DatabaseManager
+from utils.html_gzip import guardar_html
+from utils.portadas import fichero_portada
 
 db = DatabaseManager()
 
@@ -30,22 +32,7 @@ def generar_seccion_pendientes():
                 diff = float(last_checked) - float(reading)
                 if diff > 0:
                     slug_path = '/mangas/' + m['local_storage_path'].split('mangas/')[-1]
-                    
-                    # Buscar portada con cualquier extension
-                    manga_dir = m['local_storage_path']
-                    portada_file = None
-                    for ext in ['webp', 'jpg', 'png']:
-                        test_file = f'portada.{ext}'
-                        test_path = os.path.join(manga_dir, test_file)
-                        if os.path.exists(test_path):
-                            portada_file = test_file
-                            break
-                    
-                    # Si no existe ninguna, usar webp por defecto
-                    if not portada_file:
-                        portada_file = 'portada.webp'
-                    
-                    portada_path = f'{slug_path}/{portada_file}'
+                    portada_path = f'{slug_path}/{fichero_portada(m)}'
                     
                     pendientes.append({
                         'title': m['title'],
@@ -112,7 +99,7 @@ def generar_seccion_seguimiento():
                 diff = float(current) - float(last_checked)
                 if diff > 0:
                     slug_path = '/mangas/' + m['local_storage_path'].split('mangas/')[-1]
-                    portada_path = f'{slug_path}/portada.webp'
+                    portada_path = f'{slug_path}/{fichero_portada(m)}'
                     reading = m.get('current_reading', '?')
                     
                     con_nuevos.append({
@@ -210,7 +197,7 @@ def generar_seccion_mangas():
                 slug_path = '/mangas/' + m['local_storage_path'].split('mangas/')[-1]
                 current = m.get('last_checked_chapter', '?')
                 reading = m.get('current_reading', '?')
-                portada_path = f'{slug_path}/portada.webp'
+                portada_path = f'{slug_path}/{fichero_portada(m)}'
                 
                 html += f'      <a href="{slug_path}/" class="manga-card">\n'
                 html += f'        <div class="manga-cover">\n'
@@ -534,8 +521,7 @@ def regenerar_seccion_seguimiento():
     index_path = os.path.join(base_dir, 'index.html')
     
     if not os.path.exists(index_path):
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(generar_index_principal())
+        guardar_html(index_path, generar_index_principal())
         return
     
     with open(index_path, 'r', encoding='utf-8') as f:
@@ -547,8 +533,7 @@ def regenerar_seccion_seguimiento():
     patron = r'<section id="seccion-seguimiento".*?</section>'
     nuevo_contenido = re.sub(patron, nueva_seccion.strip(), contenido, flags=re.DOTALL)
     
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(nuevo_contenido)
+    guardar_html(index_path, nuevo_contenido)
 
 def regenerar_seccion_mangas():
     """
@@ -557,8 +542,7 @@ def regenerar_seccion_mangas():
     index_path = os.path.join(base_dir, 'index.html')
     
     if not os.path.exists(index_path):
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(generar_index_principal())
+        guardar_html(index_path, generar_index_principal())
         return
     
     with open(index_path, 'r', encoding='utf-8') as f:
@@ -570,16 +554,14 @@ def regenerar_seccion_mangas():
     patron = r'<section id="seccion-mangas".*?</section>'
     nuevo_contenido = re.sub(patron, nueva_seccion.strip(), contenido, flags=re.DOTALL)
     
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(nuevo_contenido)
+    guardar_html(index_path, nuevo_contenido)
         
 def regenerar_seccion_pendientes():
     """Actualiza solo seccion pendientes en index.html existente"""
     index_path = os.path.join(base_dir, 'index.html')
     
     if not os.path.exists(index_path):
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(generar_index_principal())
+        guardar_html(index_path, generar_index_principal())
         return
     
     with open(index_path, 'r', encoding='utf-8') as f:
@@ -591,5 +573,4 @@ def regenerar_seccion_pendientes():
     patron = r'<section id="seccion-pendientes".*?</section>'
     nuevo_contenido = re.sub(patron, nueva_seccion.strip(), contenido, flags=re.DOTALL)
     
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(nuevo_contenido)
\ No newline at end of file
+    guardar_html(index_path, nuevo_contenido)
\ No newline at end of file
@@ -212,7 +212,7 @@ def descargar(page_mode=0):
             logger.log(msg)
             
             try:
-                results, descargados, check_time = check_and_download(page_mode, mode_debug=True, logger=logger)
+                results, descargados, check_time = check_and_download(page_mode, mode_debug=True, logger=logger, streaming=True)
                 show_summary(results, descargados, check_time, mode_debug=True, logger=logger)
                 
                 msg = "\nRegenerando web..."
@@ -291,7 +291,7 @@ def tarea_diaria():
                 print(msg)
                 logger.log(msg)
                 
-                results, descargados, check_time = check_and_download(mode_debug=False, logger=logger)
+                results, descargados, check_time = check_and_download(mode_debug=False, logger=logger, streaming=True, incremental=True)
                 show_summary(results, descargados, check_time, mode_debug=True, logger=logger)
                 
                 # Regenerar web
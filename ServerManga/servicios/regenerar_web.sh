@@ -14,12 +14,12 @@ import sys
 import os
 sys.path.insert(0, '$PROJECT_DIR')
 from server.server_utils import generar_index_principal
+from utils.html_gzip import guardar_html
 
 index_path = os.path.join('$PROJECT_DIR', 'index.html')
 print(f'Ruta absoluta: {index_path}')
 
-with open(index_path, 'w', encoding='utf-8') as f:
-    f.write(generar_index_principal())
+guardar_html(index_path, generar_index_principal())
 print('Index principal generado')
 "
 
@@ -0,0 +1,103 @@
+# benchmark_servidor.py (ejecutar desde raiz proyecto)
+# CPU del servidor por MB servido: copia por trozos en Python vs sendfile
+# (medida dentro del proceso servidor, solo durante las peticiones)
+# Uso: python3 test/benchmark_servidor.py [MB por fichero] [peticiones]
+
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_IMAGEN = 'mangas/benchmark/raw_Capitulo_1/pagina_001.jpg'
+
+
+def cpu_proceso():
+    uso = resource.getrusage(resource.RUSAGE_SELF)
+    return uso.ru_utime + uso.ru_stime
+
+
+def servir(directorio, puerto, peticiones, usar_sendfile):
+    """
+    Proceso hijo: atiende N peticiones y escribe por stdout la CPU gastada
+    solo en el bucle de servir (sin arranque del interprete ni imports)
+    """
+    # DB desechable: importar server crea un DatabaseManager
+    os.environ['MANGA_DB_PATH'] = os.path.join(directorio, 'manga_tracker.db')
+    sys.path.insert(0, raiz)
+    from server import server
+
+    server.base_dir = directorio
+    server.MiServidor.USAR_SENDFILE = usar_sendfile
+    servidor = server.ServidorConcurrente(('127.0.0.1', puerto), server.MiServidor, 1)
+    print("LISTO", flush=True)
+
+    antes = cpu_proceso()
+    for _ in range(peticiones):
+        servidor.handle_request()
+    servidor._pool.shutdown(wait=True)
+    cpu = cpu_proceso() - antes
+    servidor.server_close()
+
+    print(f"CPU {cpu}", flush=True)
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def medir(directorio, peticiones, usar_sendfile):
+    puerto = puerto_libre()
+    hijo = subprocess.Popen(
+        [sys.executable, __file__, '--servir', directorio, str(puerto), str(peticiones), str(int(usar_sendfile))],
+        stdout=subprocess.PIPE, text=True
+    )
+    hijo.stdout.readline()
+
+    t_start = time.time()
+
+    total = 0
+    url = f'http://127.0.0.1:{puerto}/{RUTA_IMAGEN}'
+    for _ in range(peticiones - 1):
+        total += len(urllib.request.urlopen(url).read())
+
+    # Ultima peticion: comprobar Range
+    peticion = urllib.request.Request(url, headers={'Range': 'bytes=100-1099'})
+    respuesta = urllib.request.urlopen(peticion)
+    parcial = respuesta.read()
+    total += len(parcial)
+
+    cpu = float(hijo.stdout.readline().split()[1])
+    hijo.wait()
+    t_total = time.time() - t_start
+
+    mb = total / (1024 * 1024)
+    modo = 'sendfile' if usar_sendfile else 'copyfile'
+
+    print(f"{modo:>9}: {mb:.0f} MB en {t_total:.2f}s | CPU servidor {cpu:.3f}s | "
+          f"{cpu * 1000 / mb:.2f} ms CPU/MB | Range -> {respuesta.status} ({len(parcial)} bytes)")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--servir':
+        servir(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), sys.argv[5] == '1')
+        sys.exit(0)
+
+    mb_fichero = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    peticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, RUTA_IMAGEN)
+        os.makedirs(os.path.dirname(ruta))
+        with open(ruta, 'wb') as f:
+            f.write(os.urandom(mb_fichero * 1024 * 1024))
+
+        print(f"Fichero: {mb_fichero} MB, {peticiones} peticiones por modo\n")
+        medir(directorio, peticiones, False)
+        medir(directorio, peticiones, True)
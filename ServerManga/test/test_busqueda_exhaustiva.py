@@ -0,0 +1,51 @@
+# test_busqueda_exhaustiva.py (ejecutar desde raiz proyecto)
+# Busqueda de ultimo recurso de olympus_com sin red: paginas falsas de /api/series
+# Uso: python3 -m pytest -q test/test_busqueda_exhaustiva.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkers.olympus_com_api_client import OlympusComAPIClient
+
+PAGINAS = {
+    1: [{'name': 'Otra Serie', 'slug': 'otra-serie'}],
+    2: [{'name': 'Foo: El Regreso', 'slug': 'foo-el-regreso'},
+        {'name': 'Bar', 'slug': 'bar'}],
+    3: [{'name': 'Baz (Novela)', 'slug': 'baz-novela'}],
+}
+
+
+class ClienteFalso(OlympusComAPIClient):
+    def _get_page_cached(self, url):
+        return {'data': {'series': {'last_page': len(PAGINAS), 'data': PAGINAS[1]}}}
+
+    def _descargar_series(self, direction, page):
+        return {'last_page': len(PAGINAS), 'data': PAGINAS[page]}
+
+
+def buscar(*titulos):
+    resultados = {}
+    manga_list = [{'id': i, 'title': titulo} for i, titulo in enumerate(titulos)]
+    ClienteFalso()._busqueda_exhaustiva(manga_list, resultados)
+    return {manga_list[i]['title']: r['serie']['slug'] for i, r in resultados.items()}
+
+
+def test_titulo_contenido_en_nombre_con_subtitulo():
+    assert buscar('Foo') == {'Foo': 'foo-el-regreso'}
+
+
+def test_exacto_y_contenido_a_la_vez():
+    assert buscar('Bar', 'Baz') == {'Bar': 'bar', 'Baz': 'baz-novela'}
+
+
+def test_no_encontrado():
+    assert buscar('Qux') == {}
+
+
+if __name__ == '__main__':
+    test_titulo_contenido_en_nombre_con_subtitulo()
+    test_exacto_y_contenido_a_la_vez()
+    test_no_encontrado()
+    print("OK")
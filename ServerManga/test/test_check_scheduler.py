@@ -0,0 +1,49 @@
+# test_check_scheduler.py (ejecutar desde raiz proyecto)
+# Intervalo aprendido del scheduler incremental sin BD
+# Uso: python3 -m pytest -q test/test_check_scheduler.py
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.check_scheduler import calcular_intervalo, fechas_de_avance
+
+INICIO = datetime(2026, 1, 1, 9, 0)
+
+
+def semanal_con_repeticiones():
+    """
+    Capitulo nuevo cada semana, chequeo diario y sin descargar:
+    cada chequeo repite 'nuevos' con el mismo capitulo hasta que sale el siguiente
+    """
+    chequeos = []
+    for dia in range(28):
+        capitulo = str(10 + dia // 7)
+        chequeos.append((INICIO + timedelta(days=dia), capitulo))
+    return chequeos
+
+
+def test_repeticiones_del_mismo_capitulo_no_acortan_el_intervalo():
+    fechas = fechas_de_avance(semanal_con_repeticiones())
+    assert len(fechas) == 4
+    assert calcular_intervalo(fechas) == timedelta(days=7)
+
+
+def test_sin_filtrar_el_intervalo_se_reduce_al_ritmo_de_chequeo():
+    # Lo que pasaba antes: todas las filas has_new contaban como evento
+    fechas = [fecha for fecha, _ in semanal_con_repeticiones()]
+    assert calcular_intervalo(fechas) == timedelta(days=1)
+
+
+def test_historial_sin_capitulo_cuenta_todas_las_filas():
+    chequeos = [(INICIO + timedelta(days=7 * i), None) for i in range(4)]
+    assert fechas_de_avance(chequeos) == [fecha for fecha, _ in chequeos]
+
+
+if __name__ == '__main__':
+    test_repeticiones_del_mismo_capitulo_no_acortan_el_intervalo()
+    test_sin_filtrar_el_intervalo_se_reduce_al_ritmo_de_chequeo()
+    test_historial_sin_capitulo_cuenta_todas_las_filas()
+    print("OK")
@@ -0,0 +1,58 @@
+# test_portadas.py (ejecutar desde raiz proyecto)
+# Portada de mangas sin cover_path: el disco se sondea una sola vez por manga
+# Uso: python3 -m pytest -q test/test_portadas.py
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import portadas
+
+
+def contar_sondeos(manga, renders):
+    llamadas = []
+    original = portadas.buscar_portada
+
+    def buscar_contando(manga_dir):
+        llamadas.append(manga_dir)
+        return original(manga_dir)
+
+    portadas.buscar_portada = buscar_contando
+    try:
+        ficheros = [portadas.fichero_portada(manga) for _ in range(renders)]
+    finally:
+        portadas.buscar_portada = original
+    return ficheros, len(llamadas)
+
+
+def test_portada_en_disco_se_sondea_una_vez():
+    with tempfile.TemporaryDirectory() as manga_dir:
+        open(os.path.join(manga_dir, 'portada.jpg'), 'wb').close()
+        manga = {'id': 1001, 'cover_path': None, 'local_storage_path': manga_dir}
+        ficheros, sondeos = contar_sondeos(manga, 5)
+        assert ficheros == ['portada.jpg'] * 5
+        assert sondeos == 1
+
+
+def test_sin_portada_el_negativo_tambien_se_recuerda():
+    with tempfile.TemporaryDirectory() as manga_dir:
+        manga = {'id': 1002, 'cover_path': '', 'local_storage_path': manga_dir}
+        ficheros, sondeos = contar_sondeos(manga, 5)
+        assert ficheros == [portadas.PORTADA_DEFECTO] * 5
+        assert sondeos == 1
+
+
+def test_cover_path_registrado_no_toca_el_disco():
+    manga = {'id': 1003, 'cover_path': 'portada.png', 'local_storage_path': '/no/existe'}
+    ficheros, sondeos = contar_sondeos(manga, 3)
+    assert ficheros == ['portada.png'] * 3
+    assert sondeos == 0
+
+
+if __name__ == '__main__':
+    test_portada_en_disco_se_sondea_una_vez()
+    test_sin_portada_el_negativo_tambien_se_recuerda()
+    test_cover_path_registrado_no_toca_el_disco()
+    print("OK")
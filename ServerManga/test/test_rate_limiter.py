@@ -0,0 +1,57 @@
+# test_rate_limiter.py (ejecutar desde raiz proyecto)
+# Solo las senales de bloqueo frenan el host (respuestas de Playwright falsas)
+# Uso: python3 -m pytest -q test/test_rate_limiter.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rate_limiter import RateLimiter
+
+
+class NavegacionFalsa:
+    """Lo que usa el limiter de playwright.Response"""
+
+    def __init__(self, status, headers=None, cuerpo=''):
+        self.status = status
+        self.headers = headers or {}
+        self._cuerpo = cuerpo
+
+    def text(self):
+        return self._cuerpo
+
+
+def nuevo_limiter():
+    return RateLimiter('test', intervalo=10.0, minimo=1.0, maximo=100.0)
+
+
+def test_pagina_sana_acelera():
+    limiter = nuevo_limiter()
+    html = NavegacionFalsa(200, {'content-type': 'text/html'}, '<html>capitulo</html>')
+    assert limiter.registrar_navegacion(html) is False
+    assert limiter.intervalo < 10.0
+
+
+def test_429_y_cloudflare_frenan():
+    limiter = nuevo_limiter()
+    assert limiter.registrar_navegacion(NavegacionFalsa(429, {'retry-after': '3'})) is True
+    assert limiter.intervalo == 20.0
+
+    desafio = NavegacionFalsa(200, {'content-type': 'text/html'}, '<title>Just a moment...</title>')
+    assert limiter.registrar_navegacion(desafio) is True
+    assert limiter.intervalo == 40.0
+
+
+def test_404_y_sin_respuesta_no_cambian_el_ritmo():
+    limiter = nuevo_limiter()
+    assert limiter.registrar_navegacion(NavegacionFalsa(404)) is False
+    assert limiter.registrar_navegacion(None) is False
+    assert limiter.intervalo == 10.0
+
+
+if __name__ == '__main__':
+    test_pagina_sana_acelera()
+    test_429_y_cloudflare_frenan()
+    test_404_y_sin_respuesta_no_cambian_el_ritmo()
+    print("OK")
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(base_dir, 'cache')
+
+# Segundos que una respuesta se da por buena sin preguntar al servidor.
+# Pasado el TTL se revalida con If-None-Match / If-Modified-Since
+TTL_DEFECTO = 600
+
+
+class CacheRespuestas:
+    """
+    Cache en disco de respuestas JSON, una entrada por URL+params.
+    Guarda el ETag/Last-Modified del servidor para revalidar (304) y
+    cuenta aciertos/fallos para el resumen del check. Thread-safe
+    """
+
+    def __init__(self, nombre, ttl=TTL_DEFECTO, directorio=None):
+        self.nombre = nombre
+        self.ttl = ttl
+        self.directorio = directorio or os.path.join(CACHE_DIR, nombre)
+        self._lock = threading.Lock()
+        self.frescas = 0        # servidas sin peticion (dentro del TTL)
+        self.revalidadas = 0    # 304: el servidor confirma que no cambio
+        self.descargadas = 0    # 200: no habia entrada o habia cambiado
+
+    def _ruta(self, url, params):
+        clave = json.dumps([url, sorted((params or {}).items())], default=str)
+        return os.path.join(self.directorio, hashlib.sha1(clave.encode('utf-8')).hexdigest() + '.json')
+
+    def leer(self, url, params=None):
+        """Entrada guardada ({'datos', 'etag', 'last_modified', 'guardado'}) o None"""
+        try:
+            with open(self._ruta(url, params), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def fresca(self, entrada):
+        return entrada is not None and time.time() - entrada.get('guardado', 0) < self.ttl
+
+    @staticmethod
+    def cabeceras_condicionales(entrada):
+        """Cabeceras para revalidar una entrada caducada"""
+        cabeceras = {}
+        if entrada:
+            if entrada.get('etag'):
+                cabeceras['If-None-Match'] = entrada['etag']
+            if entrada.get('last_modified'):
+                cabeceras['If-Modified-Since'] = entrada['last_modified']
+        return cabeceras
+
+    def guardar(self, url, params, datos, etag=None, last_modified=None):
+        """Guardar una entrada (escritura atomica)"""
+        entrada = {
+            'url': url, 'params': params, 'guardado': time.time(),
+            'etag': etag, 'last_modified': last_modified, 'datos': datos
+        }
+
+        ruta = self._ruta(url, params)
+        temporal = f"{ruta}.{threading.get_ident()}.part"
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(entrada, f)
+            os.replace(temporal, ruta)
+        except OSError as e:
+            print(f"[WARN] Cache {self.nombre}: no se pudo guardar: {e}")
+        return entrada
+
+    def renovar(self, entrada):
+        """304: la entrada sigue valida otro TTL (conserva ETag/Last-Modified)"""
+        return self.guardar(entrada['url'], entrada['params'], entrada['datos'],
+                            entrada.get('etag'), entrada.get('last_modified'))
+
+    def contar(self, tipo):
+        """tipo: 'frescas' | 'revalidadas' | 'descargadas'"""
+        with self._lock:
+            setattr(self, tipo, getattr(self, tipo) + 1)
+
+    def resumen(self):
+        total = self.frescas + self.revalidadas + self.descargadas
+        if not total:
+            return None
+        aciertos = self.frescas + self.revalidadas
+        return (f"Cache {self.nombre}: {aciertos}/{total} aciertos "
+                f"({self.frescas} sin peticion, {self.revalidadas} revalidadas 304, "
+                f"{self.descargadas} descargadas)")
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(nombre, ttl=TTL_DEFECTO):
+    """Cache compartida por nombre (los contadores son de todo el proceso)"""
+    with _caches_lock:
+        cache = _caches.get(nombre)
+        if cache is None:
+            cache = CacheRespuestas(nombre, ttl)
+            _caches[nombre] = cache
+        return cache
+
+
+def resumen_caches():
+    """Lineas de resumen de las caches usadas en este proceso"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [linea for linea in (c.resumen() for c in caches) if linea]
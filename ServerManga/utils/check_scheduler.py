@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from statistics import median
+
+# Un titulo entra en el chequeo cuando ha pasado este % de su intervalo habitual
+# desde el ultimo capitulo nuevo (0.8 -> un semanal se mira a partir del dia ~5.6)
+FACTOR_ADELANTO = 0.8
+
+# Limites del intervalo aprendido
+MIN_INTERVALO = timedelta(hours=12)
+MAX_INTERVALO = timedelta(days=30)
+
+# Pase lo que pase, ningun titulo pasa mas de esto sin chequearse
+MAX_SIN_CHEQUEO = timedelta(days=7)
+
+# Eventos 'nuevos' necesarios para fiarse del intervalo
+MIN_EVENTOS = 3
+
+
+def _parse_fecha(valor):
+    """Timestamps de sqlite (str) o datetime"""
+    if valor is None or isinstance(valor, datetime):
+        return valor
+    try:
+        return datetime.fromisoformat(str(valor))
+    except ValueError:
+        return None
+
+
+def fechas_de_avance(chequeos):
+    """
+    chequeos: [(fecha, capitulo)] de chequeos con 'nuevos', en orden.
+    Solo cuenta la primera vez que se ve cada capitulo: mientras no se
+    descarga, has_new se repite en cada chequeo con el mismo capitulo y
+    el intervalo aprendido se reduciria al ritmo de los chequeos.
+    Filas sin capitulo (historial antiguo) se cuentan todas
+    """
+    fechas = []
+    anterior = None
+    for fecha, capitulo in chequeos:
+        if capitulo is None or capitulo != anterior:
+            fechas.append(fecha)
+        if capitulo is not None:
+            anterior = capitulo
+    return fechas
+
+
+def calcular_intervalo(fechas_nuevos):
+    """
+    Intervalo de publicacion aprendido: mediana entre avances de capitulo
+    consecutivos (ver fechas_de_avance). None si no hay historial suficiente
+    """
+    fechas = sorted(f for f in (_parse_fecha(v) for v in fechas_nuevos) if f)
+    if len(fechas) < MIN_EVENTOS:
+        return None
+
+    huecos = [b - a for a, b in zip(fechas, fechas[1:])]
+    intervalo = median(huecos)
+    return min(MAX_INTERVALO, max(MIN_INTERVALO, intervalo))
+
+
+def evaluar_manga(manga, fechas_nuevos, ahora=None):
+    """
+    Retorna (pendiente, prioridad). Prioridad alta = mas probable que haya salido algo:
+    tiempo desde el ultimo capitulo nuevo dividido por el intervalo habitual
+    """
+    ahora = ahora or datetime.now()
+    ultimo_check = _parse_fecha(manga.get('last_check_timestamp'))
+
+    # Nunca chequeado o sin historial suficiente -> siempre y primero
+    intervalo = calcular_intervalo(fechas_nuevos)
+    if ultimo_check is None or intervalo is None:
+        return True, float('inf')
+
+    ultimo_nuevo = max(f for f in (_parse_fecha(v) for v in fechas_nuevos) if f)
+    prioridad = (ahora - ultimo_nuevo) / intervalo
+
+    if ahora - ultimo_check >= MAX_SIN_CHEQUEO:
+        return True, prioridad
+
+    # El ultimo chequeo fallo -> reintentar
+    if manga.get('last_check_status') == 'error':
+        return True, prioridad
+
+    return prioridad >= FACTOR_ADELANTO, prioridad
+
+
+def seleccionar_pendientes(all_manga, historial, ahora=None, mode_debug=True, logger=None):
+    """
+    Filtrar los mangas que toca chequear y ordenarlos por probabilidad de novedad
+    historial: {manga_id: [fechas de chequeos con nuevos]}
+    """
+    ahora = ahora or datetime.now()
+    pendientes = []
+    saltados = 0
+
+    for manga in all_manga:
+        pendiente, prioridad = evaluar_manga(manga, historial.get(manga['id'], []), ahora)
+        if pendiente:
+            pendientes.append((prioridad, manga))
+        else:
+            saltados += 1
+            msg = f"  [SKIP] {manga['title']}: aun no toca (prioridad {prioridad:.2f})"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+
+    pendientes.sort(key=lambda p: p[0], reverse=True)
+
+    msg = f"[SCHEDULER] {len(pendientes)} manga(s) pendientes, {saltados} saltados"
+    if mode_debug:
+        print(msg)
+    if logger:
+        logger.log(msg)
+
+    return [manga for _, manga in pendientes]
@@ -0,0 +1,132 @@
+import re
+from functools import lru_cache
+
+PATRON_PUNTUACION = re.compile(r'[^\w\s]')
+
+# Similitud minima (Jaccard de trigramas) para aceptar un nombre parecido
+UMBRAL_DIFUSO = 0.6
+
+# Nombres normalizados mas cortos que esto no se emparejan por aproximacion
+# (demasiados falsos positivos)
+MIN_LONGITUD_DIFUSO = 6
+
+
+@lru_cache(maxsize=65536)
+def normalizar_nombre(nombre):
+    """Normalizar nombre para comparacion (lowercase, sin espacios ni puntuacion)"""
+    nombre = ' '.join(nombre.lower().split())
+    nombre = PATRON_PUNTUACION.sub('', nombre)
+    return nombre.replace(' ', '')
+
+
+def trigramas(nombre_normalizado):
+    """Conjunto de trigramas (con bordes para que cuenten inicio y final)"""
+    texto = f'  {nombre_normalizado} '
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class EmparejadorNombres:
+    """
+    Indice de los titulos buscados: {nombre_normalizado: [claves]} para la
+    coincidencia exacta y {trigrama: {claves}} para la aproximada.
+    Cada titulo se normaliza una vez al crear el indice y cada serie de una
+    pagina una vez al emparejarla (en vez de paginas x mangas x series)
+    """
+
+    def __init__(self, titulos, umbral=UMBRAL_DIFUSO):
+        """titulos: {clave: titulo}"""
+        self.umbral = umbral
+        self._nombres = {}
+        self._por_nombre = {}
+        self._trigramas = {}
+        self._por_trigrama = {}
+
+        for clave, titulo in titulos.items():
+            nombre = normalizar_nombre(titulo)
+            self._nombres[clave] = nombre
+            self._por_nombre.setdefault(nombre, []).append(clave)
+
+            if len(nombre) >= MIN_LONGITUD_DIFUSO:
+                tris = trigramas(nombre)
+                self._trigramas[clave] = tris
+                for tri in tris:
+                    self._por_trigrama.setdefault(tri, set()).add(clave)
+
+    def nombre_normalizado(self, clave):
+        return self._nombres[clave]
+
+    def exactos(self, nombre_serie):
+        """Claves cuyo titulo normalizado coincide con nombre_serie"""
+        return self._por_nombre.get(normalizar_nombre(nombre_serie), [])
+
+    def parecidos(self, nombre_serie):
+        """[(similitud, clave)] con similitud >= umbral, de mayor a menor"""
+        nombre = normalizar_nombre(nombre_serie)
+        if len(nombre) < MIN_LONGITUD_DIFUSO:
+            return []
+
+        tris = trigramas(nombre)
+        comunes = {}
+        for tri in tris:
+            for clave in self._por_trigrama.get(tri, ()):
+                comunes[clave] = comunes.get(clave, 0) + 1
+
+        resultado = []
+        for clave, n in comunes.items():
+            similitud = n / (len(tris) + len(self._trigramas[clave]) - n)
+            if similitud >= self.umbral:
+                resultado.append((similitud, clave))
+
+        resultado.sort(reverse=True)
+        return resultado
+
+    def emparejar_pagina(self, series, pendientes=None, difuso=False):
+        """
+        Primera serie de la pagina que coincide exactamente con cada clave.
+        pendientes: limitar a estas claves (None = todas)
+        difuso: las claves sin coincidencia exacta se quedan con la serie mas parecida
+        Retorna {clave: serie}
+        """
+        encontrados = {}
+        for serie in series:
+            for clave in self.exactos(serie['name']):
+                if clave in encontrados:
+                    continue
+                if pendientes is not None and clave not in pendientes:
+                    continue
+                encontrados[clave] = serie
+
+        if difuso:
+            for clave, (_, serie) in self.mejores_parecidos(series, pendientes).items():
+                encontrados.setdefault(clave, serie)
+        return encontrados
+
+    def contenidos(self, series, pendientes):
+        """
+        Fallback por contencion para las claves pendientes: primera serie cuyo
+        nombre normalizado contiene el titulo normalizado ("Foo" ->
+        "Foo: El Regreso"). Recorre series x pendientes, usar solo con lo
+        que no resolvio la busqueda por diccionario.
+        Retorna {clave: serie}
+        """
+        encontrados = {}
+        for serie in series:
+            nombre_serie = normalizar_nombre(serie['name'])
+            for clave in pendientes:
+                if clave not in encontrados and self._nombres[clave] and self._nombres[clave] in nombre_serie:
+                    encontrados[clave] = serie
+        return encontrados
+
+    def mejores_parecidos(self, series, pendientes=None):
+        """
+        Mejor serie aproximada de la pagina para cada clave.
+        Retorna {clave: (similitud, serie)}
+        """
+        mejores = {}
+        for serie in series:
+            for similitud, clave in self.parecidos(serie['name']):
+                if pendientes is not None and clave not in pendientes:
+                    continue
+                if clave not in mejores or similitud > mejores[clave][0]:
+                    mejores[clave] = (similitud, serie)
+        return mejores
@@ -0,0 +1,31 @@
+import gzip
+import os
+
+# Nivel alto: se comprime una vez al generar, no en cada peticion
+NIVEL_GZIP = 9
+EXTENSION_GZIP = '.gz'
+
+
+def ruta_gzip(filepath):
+    """Ruta de la variante precomprimida (index.html -> index.html.gz)"""
+    return filepath + EXTENSION_GZIP
+
+
+def _escribir_atomico(filepath, datos):
+    """Escribir a .part y renombrar (el servidor nunca ve un fichero a medias)"""
+    temporal = filepath + '.part'
+    with open(temporal, 'wb') as f:
+        f.write(datos)
+    os.replace(temporal, filepath)
+
+
+def guardar_html(filepath, html):
+    """
+    Escribir un HTML generado junto a su .gz.
+    El .gz se escribe despues, asi siempre es igual o mas nuevo que el HTML
+    (el servidor descarta los .gz mas viejos que su HTML)
+    """
+    datos = html.encode('utf-8')
+    _escribir_atomico(filepath, datos)
+    _escribir_atomico(ruta_gzip(filepath), gzip.compress(datos, compresslevel=NIVEL_GZIP, mtime=0))
+    return filepath
@@ -0,0 +1,105 @@
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Tamano del pool de conexiones keep-alive por host
+# (>= MAX_DESCARGAS_POR_HOST para que las descargas en paralelo no abran sockets nuevos)
+POOL_CONEXIONES = 4
+POOL_MAX_POR_HOST = 8
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/120.0.0.0 Safari/537.36")
+
+# Headers por defecto de cada page_type (antes copiados en cada checker/downloader)
+HEADERS_POR_TIPO = {
+    'tmo': {
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,"
+                  "image/avif,image/webp,image/apng,*/*;q=0.8",
+        "Accept-Language": "es-ES,es;q=0.9",
+        "Referer": "https://zonatmo.com/",
+        "Upgrade-Insecure-Requests": "1",
+        "DNT": "1"
+    },
+    'tmo_imagenes': {
+        "accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8",
+        "accept-language": "es-ES,es;q=0.9",
+        "referer": "https://zonatmo.com/",
+        "sec-ch-ua": '"Chromium";v="142", "Brave";v="142", "Not_A Brand";v="99"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"Windows"',
+        "sec-fetch-dest": "image",
+        "sec-fetch-mode": "no-cors",
+        "sec-fetch-site": "cross-site",
+        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
+    },
+    'tmo_covers': {
+        "User-Agent": USER_AGENT,
+        "Referer": "https://zonatmo.com/",
+        "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
+        "Accept-Language": "es-ES,es;q=0.9"
+    },
+    'animeallstar': {
+        "User-Agent": USER_AGENT,
+        "Referer": "https://animeallstar30.com/"
+    },
+}
+
+# Timeout por defecto (segundos) si el llamador no pasa uno
+TIMEOUT_POR_TIPO = {
+    'olympus_com': 30,
+    'olympus_net': 15,
+    'tmo': 15,
+    'tmo_imagenes': 30,
+    'tmo_covers': 15,
+    'animeallstar': 15,
+    'imagenes': 30,
+    'covers': 15,
+}
+TIMEOUT_DEFECTO = 15
+
+_sesiones = {}
+_sesiones_lock = threading.Lock()
+
+
+def get_session(page_type, url):
+    """
+    Session keep-alive compartida para (page_type, host).
+    Todo el proceso reutiliza la misma conexion TCP+TLS por host
+    """
+    host = urlparse(url).netloc
+    clave = (page_type, host)
+
+    with _sesiones_lock:
+        session = _sesiones.get(clave)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONEXIONES, pool_maxsize=POOL_MAX_POR_HOST)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(HEADERS_POR_TIPO.get(page_type, {}))
+            _sesiones[clave] = session
+        return session
+
+
+def get(url, page_type='default', **kwargs):
+    """requests.get sobre la session del host con timeout por defecto del page_type"""
+    kwargs.setdefault('timeout', TIMEOUT_POR_TIPO.get(page_type, TIMEOUT_DEFECTO))
+    return get_session(page_type, url).get(url, **kwargs)
+
+
+def head(url, page_type='default', **kwargs):
+    """requests.head sobre la session del host"""
+    kwargs.setdefault('timeout', TIMEOUT_POR_TIPO.get(page_type, TIMEOUT_DEFECTO))
+    return get_session(page_type, url).head(url, **kwargs)
+
+
+def cerrar_sesiones():
+    """Cerrar todas las sesiones (fin de proceso)"""
+    with _sesiones_lock:
+        for session in _sesiones.values():
+            session.close()
+        _sesiones.clear()
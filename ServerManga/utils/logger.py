@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 from datetime import datetime
 
 class Logger:
@@ -7,6 +8,7 @@ class Logger:
         self.log_file_path = log_file_path
         self.function_name = function_name
         self.file = None
+        self._lock = threading.Lock()
         
         # Crear directorio logs si no existe
         log_dir = os.path.dirname(log_file_path)
@@ -36,10 +38,12 @@ class Logger:
     
     def log(self, message):
         """Escribir en log (siempre si existe logger)"""
-        if self.file:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.file.write(f"[{timestamp}] {message}\n")
-            self.file.flush()
+        # Lock: varios hilos (una lane por pagina) comparten el mismo logger
+        with self._lock:
+            if self.file:
+                timestamp = datetime.now().strftime("%H:%M:%S")
+                self.file.write(f"[{timestamp}] {message}\n")
+                self.file.flush()
     
     def close(self):
         if self.file:
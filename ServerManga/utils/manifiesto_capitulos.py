@@ -0,0 +1,91 @@
+import json
+import os
+import re
+import threading
+
+# Manifiesto en la raiz del manga (fuera de contenido/ para que escribirlo
+# no cambie el mtime de contenido/, que es lo que delata capitulos nuevos)
+NOMBRE_MANIFIESTO = 'capitulos.json'
+PATRON_CAPITULO = re.compile(r'^capitulo_(\d+(?:\.\d+)?)\.html$')
+
+# Cache en memoria del servidor: {ruta_manifiesto: (mtime_ns, capitulos)}
+_cache = {}
+_lock = threading.Lock()
+
+
+def ruta_manifiesto(content_dir):
+    """<manga>/contenido -> <manga>/capitulos.json"""
+    return os.path.join(os.path.dirname(os.path.normpath(content_dir)), NOMBRE_MANIFIESTO)
+
+
+def _ordenar(capitulos):
+    """Descendente (mas recientes primero), como lo pinta manga_index.html"""
+    return sorted(capitulos, key=lambda c: c['number'], reverse=True)
+
+
+def construir_manifiesto(content_dir):
+    """Listar contenido/ una vez y sacar los capitulo_X.html"""
+    capitulos = []
+    for nombre in os.listdir(content_dir):
+        m = PATRON_CAPITULO.match(nombre)
+        if m:
+            capitulos.append({'number': float(m.group(1)), 'file': nombre})
+    return _ordenar(capitulos)
+
+
+def _guardar(ruta, capitulos):
+    temporal = ruta + '.part'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(capitulos, f)
+    os.replace(temporal, ruta)
+
+
+def registrar_capitulo(content_dir, chapter_num):
+    """
+    Actualizar el manifiesto tras crear capitulo_X.html.
+    Se relista contenido/ (una vez por capitulo descargado, no por visita)
+    para recoger tambien capitulos copiados a mano
+    """
+    ruta = ruta_manifiesto(content_dir)
+    with _lock:
+        capitulos = construir_manifiesto(content_dir)
+        _guardar(ruta, capitulos)
+        _cache.pop(ruta, None)
+    return capitulos
+
+
+def leer_manifiesto(content_dir):
+    """
+    Capitulos de un manga para la API. Se sirve de memoria mientras el
+    manifiesto siga al dia; solo se lista contenido/ si no existe o si
+    contenido/ ha cambiado despues (capitulos copiados a mano)
+    """
+    ruta = ruta_manifiesto(content_dir)
+
+    try:
+        st_contenido = os.stat(content_dir)
+    except OSError:
+        return []
+
+    try:
+        mtime = os.stat(ruta).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    with _lock:
+        if mtime is not None and mtime >= st_contenido.st_mtime_ns:
+            cacheado = _cache.get(ruta)
+            if cacheado and cacheado[0] == mtime:
+                return cacheado[1]
+            try:
+                with open(ruta, 'r', encoding='utf-8') as f:
+                    capitulos = json.load(f)
+                _cache[ruta] = (mtime, capitulos)
+                return capitulos
+            except (OSError, ValueError):
+                pass
+
+        capitulos = construir_manifiesto(content_dir)
+        _guardar(ruta, capitulos)
+        _cache[ruta] = (os.stat(ruta).st_mtime_ns, capitulos)
+        return capitulos
@@ -0,0 +1,48 @@
+import hashlib
+import os
+import re
+import threading
+
+DIR_TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+PATRON_MARCADOR = re.compile(r'\{\{([A-Z_]+)\}\}')
+
+# Plantillas ya compiladas en este proceso: {ruta: Plantilla}
+_cache = {}
+_lock = threading.Lock()
+
+
+class Plantilla:
+    """
+    Template partido una sola vez en literales y marcadores {{NOMBRE}}.
+    render() rellena los huecos y hace un unico join (en vez de un
+    str.replace por marcador sobre el HTML entero)
+    """
+
+    def __init__(self, texto):
+        # Cambia cuando se edita el template (regeneraciones masivas lo comparan)
+        self.hash = hashlib.sha1(texto.encode('utf-8')).hexdigest()
+        partes = PATRON_MARCADOR.split(texto)
+        # Posiciones pares: literales. Impares: nombre del marcador
+        self.partes = partes
+        self.huecos = [(i, partes[i]) for i in range(1, len(partes), 2)]
+
+    def render(self, **valores):
+        partes = self.partes[:]
+        for i, nombre in self.huecos:
+            # Marcador sin valor -> se deja tal cual (como hacia replace)
+            valor = valores.get(nombre)
+            partes[i] = '{{' + nombre + '}}' if valor is None else str(valor)
+        return ''.join(partes)
+
+
+def cargar_plantilla(nombre):
+    """Plantilla compilada (nombre dentro de templates/ o ruta absoluta), una vez por proceso"""
+    ruta = nombre if os.path.isabs(nombre) else os.path.join(DIR_TEMPLATES, nombre)
+
+    with _lock:
+        plantilla = _cache.get(ruta)
+        if plantilla is None:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                plantilla = Plantilla(f.read())
+            _cache[ruta] = plantilla
+        return plantilla
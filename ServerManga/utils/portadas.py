@@ -0,0 +1,61 @@
+import os
+import threading
+
+# Extensiones con las que los downloaders guardan portada.<ext>
+EXTENSIONES_PORTADA = ('webp', 'jpg', 'jpeg', 'png')
+PORTADA_DEFECTO = 'portada.webp'
+
+# Sondeos de disco de fichero_portada por manga: {(id, ruta): fichero o None}.
+# Tambien guarda los negativos: sin esto cada render del index repetia hasta
+# 4 exists() por manga sin cover_path. Las portadas nuevas se registran en
+# cover_path (portada_registrada/update_cover_path), que tiene prioridad
+_sondeos = {}
+_sondeos_lock = threading.Lock()
+
+
+def buscar_portada(manga_dir):
+    """
+    Buscar portada.<ext> en disco. Solo para mangas sin cover_path
+    registrado (migracion y downloaders antes de descargar)
+    """
+    for ext in EXTENSIONES_PORTADA:
+        fichero = f'portada.{ext}'
+        if os.path.exists(os.path.join(manga_dir, fichero)):
+            return fichero
+    return None
+
+
+def fichero_portada(manga):
+    """
+    Fichero de portada registrado. Solo se mira el disco si cover_path esta
+    vacio (BD sin migrar o portada anterior al registro), para no perder
+    portadas .jpg/.png existentes
+    """
+    if manga.get('cover_path'):
+        return manga['cover_path']
+
+    clave = (manga.get('id'), manga['local_storage_path'])
+    with _sondeos_lock:
+        if clave in _sondeos:
+            return _sondeos[clave] or PORTADA_DEFECTO
+
+    existente = buscar_portada(manga['local_storage_path'])
+    with _sondeos_lock:
+        _sondeos[clave] = existente
+    return existente or PORTADA_DEFECTO
+
+
+def portada_registrada(manga, db):
+    """
+    True si el manga ya tiene portada. Si existe en disco pero no estaba
+    registrada se registra ahora (solo pasa una vez por manga)
+    """
+    if manga.get('cover_path'):
+        return True
+
+    existente = buscar_portada(manga['local_storage_path'])
+    if existente:
+        db.update_cover_path(manga['id'], existente)
+        manga['cover_path'] = existente
+        return True
+    return False
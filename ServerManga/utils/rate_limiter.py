@@ -0,0 +1,189 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from requests.structures import CaseInsensitiveDict
+
+# Configuracion por page_type (segundos entre peticiones al mismo host)
+#   intervalo -> ritmo inicial
+#   minimo    -> lo mas rapido que se permite ir si todo responde bien
+#   maximo    -> tope del back-off tras 403/429/5xx/Cloudflare
+#   rafaga    -> peticiones que se pueden lanzar seguidas (tokens del bucket)
+CONFIG_LIMITES = {
+    'olympus_com':  {'intervalo': 30.0, 'minimo': 5.0, 'maximo': 180.0, 'rafaga': 1},
+    # Catalogo /api/series de olympus: se recorre pagina a pagina y aguanta
+    # mas que los capitulos; la rafaga deja arrancar juntas las paginas que
+    # se piden en paralelo
+    'olympus_catalogo': {'intervalo': 3.0, 'minimo': 1.0, 'maximo': 60.0, 'rafaga': 3},
+    'olympus_net':  {'intervalo': 5.0,  'minimo': 1.0, 'maximo': 60.0,  'rafaga': 1},
+    'tmo':          {'intervalo': 30.0, 'minimo': 10.0, 'maximo': 300.0, 'rafaga': 1},
+    'animeallstar': {'intervalo': 2.0,  'minimo': 0.5, 'maximo': 30.0,  'rafaga': 1},
+    'm440':         {'intervalo': 2.0,  'minimo': 1.0, 'maximo': 30.0,  'rafaga': 1},
+    'imagenes':     {'intervalo': 0.5,  'minimo': 0.0, 'maximo': 10.0,  'rafaga': 4},
+}
+
+CONFIG_DEFECTO = {'intervalo': 2.0, 'minimo': 0.5, 'maximo': 60.0, 'rafaga': 1}
+
+# Ajuste adaptativo
+FACTOR_ACELERAR = 0.9   # respuesta sana -> intervalo * 0.9
+FACTOR_FRENAR = 2.0     # 403/429/5xx/Cloudflare -> intervalo * 2
+
+CODIGOS_BLOQUEO = (403, 429)   # ademas de cualquier 5xx
+MARCAS_CLOUDFLARE = ('Just a moment', 'cf-browser-verification', 'challenge-platform', 'Attention Required!')
+
+
+class RateLimiter:
+    """
+    Token bucket para un host. Thread-safe: varias lanes/hilos
+    que hablen con el mismo host comparten el mismo limiter
+    """
+
+    def __init__(self, nombre, intervalo, minimo, maximo, rafaga=1):
+        self.nombre = nombre
+        self.intervalo = intervalo
+        self.minimo = minimo
+        self.maximo = maximo
+        self.rafaga = max(1, rafaga)
+
+        self._tokens = float(self.rafaga)
+        self._ultimo = time.monotonic()
+        self._bloqueado_hasta = 0.0
+        self._lock = threading.Lock()
+
+    def _rellenar(self, ahora):
+        """Recargar tokens segun el tiempo pasado (con el lock tomado)"""
+        if self.intervalo <= 0:
+            self._tokens = float(self.rafaga)
+        else:
+            self._tokens = min(self.rafaga, self._tokens + (ahora - self._ultimo) / self.intervalo)
+        self._ultimo = ahora
+
+    def esperar(self):
+        """Bloquea hasta que haya token disponible para este host"""
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                self._rellenar(ahora)
+
+                espera = self._bloqueado_hasta - ahora
+                if espera <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    espera = (1 - self._tokens) * self.intervalo
+
+            time.sleep(espera)
+
+    def exito(self):
+        """Respuesta sana: acelerar hacia el minimo"""
+        with self._lock:
+            self.intervalo = max(self.minimo, self.intervalo * FACTOR_ACELERAR)
+
+    def penalizar(self, retry_after=None):
+        """Respuesta bloqueada: duplicar intervalo y respetar Retry-After"""
+        with self._lock:
+            self.intervalo = min(self.maximo, max(self.intervalo, self.minimo, 1.0) * FACTOR_FRENAR)
+            pausa = retry_after if retry_after else self.intervalo
+            self._bloqueado_hasta = max(self._bloqueado_hasta, time.monotonic() + pausa)
+            self._tokens = 0.0
+
+    def registrar_respuesta(self, response, espera_json=False, mode_debug=False, logger=None):
+        """
+        Ajustar el ritmo segun la respuesta.
+        espera_json=True -> cualquier HTML se considera bloqueo (APIs)
+        Retorna True si la respuesta era un bloqueo (403/429/5xx/Cloudflare)
+        """
+        if es_respuesta_bloqueada(response, espera_json):
+            self.penalizar(_leer_retry_after(response))
+
+            msg = f"[RATE] {self.nombre}: bloqueo (HTTP {response.status_code}), intervalo -> {self.intervalo:.1f}s"
+            if mode_debug:
+                print(msg)
+            if logger:
+                logger.log(msg)
+            return True
+
+        # Solo acelerar con respuestas sanas (un 404 no dice nada del ritmo)
+        if response is not None and 200 <= response.status_code < 400:
+            self.exito()
+        return False
+
+    def registrar_navegacion(self, response, mode_debug=False, logger=None):
+        """
+        registrar_respuesta para la respuesta de page.goto (Playwright).
+        Retorna True si la pagina era un bloqueo
+        """
+        if response is None:
+            return False
+        return self.registrar_respuesta(_RespuestaNavegador(response),
+                                        mode_debug=mode_debug, logger=logger)
+
+
+def es_respuesta_bloqueada(response, espera_json=False):
+    """403/429/5xx o pagina de desafio de Cloudflare"""
+    if response is None:
+        return False
+
+    if response.status_code in CODIGOS_BLOQUEO or response.status_code >= 500:
+        return True
+
+    if response.headers.get('cf-mitigated', '').lower() == 'challenge':
+        return True
+
+    if 'text/html' in response.headers.get('Content-Type', ''):
+        if espera_json:
+            return True
+        try:
+            inicio = response.text[:4096]
+        except Exception:
+            return False
+        return any(marca in inicio for marca in MARCAS_CLOUDFLARE)
+
+    return False
+
+
+class _RespuestaNavegador:
+    """Respuesta de Playwright con la forma de requests (status_code, headers, text)"""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status
+        # Playwright da las cabeceras en minusculas
+        self.headers = CaseInsensitiveDict(response.headers)
+
+    @property
+    def text(self):
+        return self._response.text()
+
+
+def _leer_retry_after(response):
+    """Segundos de Retry-After (solo formato numerico)"""
+    valor = response.headers.get('Retry-After')
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        return None
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(page_type, url=None):
+    """
+    Limiter compartido para (page_type, host).
+    Sin url se usa un unico bucket para todo el page_type
+    """
+    host = urlparse(url).netloc if url else ''
+    clave = (page_type, host)
+
+    with _limiters_lock:
+        limiter = _limiters.get(clave)
+        if limiter is None:
+            config = CONFIG_LIMITES.get(page_type, CONFIG_DEFECTO)
+            nombre = f"{page_type}@{host}" if host else page_type
+            limiter = RateLimiter(nombre, **config)
+            _limiters[clave] = limiter
+        return limiter